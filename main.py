@@ -5,16 +5,101 @@ Orchestrates the complete analysis workflow from PDF input to insights and visua
 
 import os
 import sys
-import json
+import glob
+import queue
+import atexit
+import asyncio
+import inspect
+import logging
 import argparse
+import functools
+import logging.handlers
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+import httpx
+import orjson
 from dotenv import load_dotenv
 
-# Import our custom modules
-from src.cerebras_client import CerebrasClient
-from src.claude_client import ClaudeClient
-from src.analysis import ClinicalTrialAnalyzer
+# Import our custom modules; the API clients and the analyzer (matplotlib)
+# are imported in ClinicalTrialPipeline.__init__ so `--help` and argument errors stay fast
+from src.llm_cache import LLMCache, SQLiteBackend, ExtractionCache, file_digest
+from src.manifest import RunManifest, stage_hash
+
+
+logger = logging.getLogger("ctc")
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _PdfTagFilter(logging.Filter):
+    """Prefix records logged with extra={"pdf": ...} so concurrent runs stay distinguishable."""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        pdf = getattr(record, "pdf", None)
+        record.pdf_tag = f"[{os.path.basename(pdf)}] " if pdf else ""
+        return True
+
+
+def setup_logging(verbose: bool = False):
+    """
+    Route the "ctc" logger through a queue so log writes happen on a listener thread
+    instead of the calling coroutine. Safe to call more than once; later calls can
+    enable verbose output but never turn it off again.
+    """
+    global _log_listener
+    if verbose:
+        logger.setLevel(logging.DEBUG)
+    if _log_listener is not None:
+        return
+    
+    if not verbose:
+        logger.setLevel(logging.INFO)
+    
+    log_queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(pdf_tag)s%(message)s"))
+    stream_handler.addFilter(_PdfTagFilter())
+    
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.propagate = False
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+    # Flush queued records before the interpreter exits
+    atexit.register(_log_listener.stop)
+
+
+# Header rules for the text reports, built once
+_SUMMARY_RULE = "=" * 30
+_FOLLOWUP_RULE = "=" * 40
+
+
+@functools.lru_cache(maxsize=4096)
+def _truncate(text: str, limit: int = 100) -> str:
+    """Shorten text to limit characters for the summary file; repeated values hit the cache."""
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _json_bytes(data: Any, indent: bool = True) -> bytes:
+    """Serialize data to UTF-8 JSON bytes with orjson."""
+    option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    return orjson.dumps(data, option=option, default=str)
+
+
+def _write_bytes(filepath: str, data: bytes):
+    """Write bytes to a file in a single call."""
+    with open(filepath, 'wb') as f:
+        f.write(data)
+
+
+def _write_report(filepath: str, title: str, rule: str, body: str):
+    """Write a titled text report with a single write call."""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(f"{title}\n{rule}\n\n{body}")
+
+
+async def _write_file(filepath: str, data: bytes) -> str:
+    """Write bytes to a file off the event loop and return the path."""
+    await asyncio.to_thread(_write_bytes, filepath, data)
+    return filepath
 
 
 class ClinicalTrialPipeline:
@@ -23,6 +108,9 @@ class ClinicalTrialPipeline:
     def __init__(self, output_dir: str = "outputs"):
         """Initialize the pipeline with required clients."""
         self.output_dir = output_dir
+        self.manifest_dir = os.path.join(output_dir, ".manifest")
+        self.http_client: Optional[httpx.AsyncClient] = None
+        setup_logging()
         self._ensure_output_dir()
         
         # Load environment variables
@@ -32,35 +120,43 @@ class ClinicalTrialPipeline:
         self._validate_environment()
         
         # Initialize clients
-        print("🔧 Initializing clients...")
+        logger.info("🔧 Initializing clients...")
         try:
+            from src.cerebras_client import CerebrasClient
             self.cerebras_client = CerebrasClient()
-            print("✅ Cerebras client initialized")
+            self.extraction_cache = ExtractionCache(os.path.join(self.output_dir, ".cerebras_cache"))
+            logger.info("✅ Cerebras client initialized")
         except Exception as e:
-            print(f"❌ Failed to initialize Cerebras client: {str(e)}")
+            logger.error(f"❌ Failed to initialize Cerebras client: {str(e)}")
             sys.exit(1)
         
         try:
-            self.claude_client = ClaudeClient()
-            print("✅ Claude client initialized")
+            cache_path = os.path.join(self.output_dir, ".llm_cache.sqlite")
+            from src.claude_client import ClaudeClient, PROMPT_VERSION, SUMMARY_ERROR_PREFIX, FOLLOWUP_ERROR_PREFIX
+            self.claude_client = ClaudeClient(cache=LLMCache(SQLiteBackend(cache_path)))
+            self.prompt_version = PROMPT_VERSION
+            # Failed summary/follow-up calls return text with these prefixes instead of raising
+            self.claude_error_prefixes = (SUMMARY_ERROR_PREFIX, FOLLOWUP_ERROR_PREFIX)
+            logger.info("✅ Claude client initialized")
         except Exception as e:
-            print(f"❌ Failed to initialize Claude client: {str(e)}")
+            logger.error(f"❌ Failed to initialize Claude client: {str(e)}")
             sys.exit(1)
         
         try:
+            from src.analysis import ClinicalTrialAnalyzer
             self.analyzer = ClinicalTrialAnalyzer(output_dir)
-            print("✅ Clinical analyzer initialized")
+            # Chart stages are rerun whenever the analyzer code itself changes
+            self.analyzer_fingerprint = file_digest(inspect.getfile(ClinicalTrialAnalyzer))
+            logger.info("✅ Clinical analyzer initialized")
         except Exception as e:
-            print(f"❌ Failed to initialize analyzer: {str(e)}")
+            logger.error(f"❌ Failed to initialize analyzer: {str(e)}")
             sys.exit(1)
         
-        print("🚀 Clinical Trial Copilot ready!")
+        logger.info("🚀 Clinical Trial Copilot ready!")
     
     def _ensure_output_dir(self):
         """Ensure output directory exists."""
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
-            print(f"📁 Created output directory: {self.output_dir}")
+        os.makedirs(self.output_dir, exist_ok=True)
     
     def _validate_environment(self):
         """Validate that required environment variables are set."""
@@ -72,22 +168,63 @@ class ClinicalTrialPipeline:
                 missing_keys.append(key)
         
         if missing_keys:
-            print("❌ Missing required environment variables:")
+            logger.error("❌ Missing required environment variables:")
             for key in missing_keys:
-                print(f"   - {key}")
-            print("\n💡 Please create a .env file with your API keys:")
-            print("   CLAUDE_API_KEY=your_anthropic_api_key_here")
-            print("   CEREBRAS_API_KEY=your_cerebras_api_key_here")
+                logger.error(f"   - {key}")
+            logger.error("\n💡 Please create a .env file with your API keys:")
+            logger.error("   CLAUDE_API_KEY=your_anthropic_api_key_here")
+            logger.error("   CEREBRAS_API_KEY=your_cerebras_api_key_here")
             sys.exit(1)
         
-        print("✅ Environment variables validated")
+        logger.info("✅ Environment variables validated")
+    
+    async def __aenter__(self):
+        """Open a pooled HTTP client shared by the Cerebras and Claude clients."""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+                timeout=httpx.Timeout(60.0)
+            )
+            self.cerebras_client.set_http_client(self.http_client)
+            self.claude_client.set_http_client(self.http_client)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aclose()
+    
+    async def aclose(self):
+        """Close the shared HTTP client; it is bound to the event loop that opened it."""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+            self.cerebras_client.set_http_client(None)
+            self.claude_client.set_http_client(None)
     
     def process_clinical_trial(self, pdf_path: str) -> Dict[str, Any]:
+        """Synchronous wrapper around aprocess_clinical_trial()."""
+        async def _run():
+            async with self:
+                return await self.aprocess_clinical_trial(pdf_path)
+        
+        return asyncio.run(_run())
+    
+    async def aprocess_clinical_trial(self, pdf_path: str, run_tag: Optional[str] = None,
+                                      force: bool = False) -> Dict[str, Any]:
         """
         Complete pipeline: PDF → Cerebras analysis → Claude insights → Visualizations
         
+        The Claude calls run concurrently: follow-up suggestions only depend on the
+        extracted data, so they are requested alongside the main analysis, while the
+        executive summary waits for the analysis it summarizes.
+        
+        Each stage is recorded in a per-PDF manifest; on re-runs, stages whose inputs
+        are unchanged and whose output files still exist are reused instead of rerun.
+        
         Args:
             pdf_path: Path to the clinical trial PDF file
+            run_tag: Optional suffix for output filenames, used to keep the outputs
+                of concurrently processed PDFs apart
+            force: Rerun every stage even if the manifest says it is up to date
             
         Returns:
             Dict containing all analysis results and file paths
@@ -95,110 +232,166 @@ class ClinicalTrialPipeline:
         if not os.path.exists(pdf_path):
             raise FileNotFoundError(f"PDF file not found: {pdf_path}")
         
-        print(f"\n🎯 Starting analysis of: {pdf_path}")
-        print("=" * 60)
+        log = logging.LoggerAdapter(logger, {"pdf": pdf_path})
+        log.info(f"🎯 Starting analysis of: {pdf_path}")
+        
+        now = datetime.now()
+        timestamp = now.strftime("%Y%m%d_%H%M%S")
+        if run_tag:
+            timestamp = f"{timestamp}_{run_tag}"
         
         results = {
             "input_file": pdf_path,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now.isoformat(),
             "clinical_data": {},
             "claude_analysis": "",
             "visualization_recommendations": {},
             "generated_files": []
         }
+        pending_writes = []
+        artifacts = []
         
         # Step 1: Extract structured data with Cerebras
-        print("\n📋 STEP 1: Extracting clinical data with Cerebras...")
+        log.info("📋 STEP 1: Extracting clinical data with Cerebras...")
         try:
-            clinical_data = self.cerebras_client.parse_clinical_trial_pdf(pdf_path)
-            results["clinical_data"] = clinical_data
-            print("✅ Clinical data extraction completed")
+            pdf_digest = await asyncio.to_thread(self.extraction_cache.digest_for, pdf_path)
+            manifest = RunManifest(self.manifest_dir, pdf_digest)
             
-            # Save raw clinical data
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            json_filename = f"clinical_data_{timestamp}.json"
-            json_filepath = os.path.join(self.output_dir, json_filename)
-            
-            with open(json_filepath, 'w', encoding='utf-8') as f:
-                json.dump(clinical_data, f, indent=2, ensure_ascii=False)
+            extraction_hash = stage_hash({"pdf": pdf_digest})
+            stage = None if force else manifest.reusable("extraction", extraction_hash)
+            if stage is not None:
+                clinical_data = stage.payload
+                json_filepath = stage.output_paths[0]
+                log.info(f"♻️  Extraction unchanged, reusing: {json_filepath}")
+            else:
+                clinical_data = await self._aextract(pdf_path, pdf_digest, log)
+                
+                # Save raw clinical data; the write overlaps with the Claude stage
+                # and is awaited together with the final summary writes
+                json_filename = f"clinical_data_{timestamp}.json"
+                json_filepath = os.path.join(self.output_dir, json_filename)
+                pending_writes.append(
+                    asyncio.create_task(_write_file(json_filepath, _json_bytes(clinical_data)))
+                )
+                # An empty extraction is a failure; don't let later runs reuse it
+                if clinical_data:
+                    manifest.record("extraction", extraction_hash, [json_filepath], clinical_data)
             
+            results["clinical_data"] = clinical_data
             results["generated_files"].append(json_filepath)
-            print(f"💾 Raw data saved to: {json_filepath}")
+            artifacts.append({"artifact": "clinical_data", "path": json_filepath, "data": clinical_data})
+            log.info("✅ Clinical data extraction completed")
             
         except Exception as e:
-            print(f"❌ Error in Cerebras analysis: {str(e)}")
+            log.error(f"❌ Error in Cerebras analysis: {str(e)}")
             return results
         
         # Step 2: Generate insights with Claude
-        print("\n🧠 STEP 2: Generating insights with Claude...")
-        try:
-            analysis_text, viz_recommendations = self.claude_client.analyze_clinical_data(clinical_data)
+        log.info("🧠 STEP 2: Generating insights with Claude...")
+        
+        # The CSV, standard charts and dashboard only depend on the extracted data, so
+        # render them in a worker thread while the Claude calls wait on the network
+        charts_hash = stage_hash({"clinical_data": clinical_data, "analyzer": self.analyzer_fingerprint})
+        charts_stage = None if force else manifest.reusable("charts", charts_hash)
+        charts_task = None
+        if charts_stage is None:
+            charts_task = asyncio.create_task(
+                asyncio.to_thread(self._render_charts, clinical_data, timestamp)
+            )
+        
+        viz_recommendations = None
+        claude_hash = stage_hash({
+            "clinical_data": clinical_data,
+            "model": self.claude_client.model,
+            "prompt_version": self.prompt_version
+        })
+        stage = None if force else manifest.reusable("claude", claude_hash)
+        if stage is not None:
+            report_file, summary_filepath, followup_filepath = stage.output_paths
+            analysis_text = stage.payload["analysis"]
+            viz_recommendations = stage.payload["visualization_recommendations"]
+            exec_summary = stage.payload["executive_summary"]
+            follow_up = stage.payload["follow_up_studies"]
             results["claude_analysis"] = analysis_text
             results["visualization_recommendations"] = viz_recommendations
-            print("✅ Claude analysis completed")
-            
-            # Save analysis report
-            report_file = self.analyzer.save_analysis_report(analysis_text)
+            log.info("♻️  Claude inputs unchanged, reusing previous reports")
+        else:
+            report_file = None
+            try:
+                report_file, summary_filepath, followup_filepath, analysis_text, exec_summary, follow_up = \
+                    await self._run_claude_stage(clinical_data, timestamp, results, log)
+                viz_recommendations = results["visualization_recommendations"]
+                if exec_summary.startswith(self.claude_error_prefixes) or \
+                        follow_up.startswith(self.claude_error_prefixes):
+                    log.warning("⚠️  Claude stage incomplete, not recording it for reuse")
+                else:
+                    manifest.record(
+                        "claude", claude_hash,
+                        [report_file, summary_filepath, followup_filepath],
+                        {
+                            "analysis": analysis_text,
+                            "visualization_recommendations": viz_recommendations,
+                            "executive_summary": exec_summary,
+                            "follow_up_studies": follow_up
+                        }
+                    )
+            except Exception as e:
+                log.error(f"❌ Error in Claude analysis: {str(e)}")
+                # Continue with visualization even if Claude analysis fails
+        
+        if report_file is not None:
             results["generated_files"].append(report_file)
-            
-            # Generate executive summary
-            print("📝 Generating executive summary...")
-            exec_summary = self.claude_client.generate_executive_summary(clinical_data, analysis_text)
-            
-            summary_filename = f"executive_summary_{timestamp}.txt"
-            summary_filepath = os.path.join(self.output_dir, summary_filename)
-            
-            with open(summary_filepath, 'w', encoding='utf-8') as f:
-                f.write("EXECUTIVE SUMMARY\n")
-                f.write("=" * 30 + "\n\n")
-                f.write(exec_summary)
+            artifacts.append({
+                "artifact": "claude_analysis",
+                "path": report_file,
+                "data": {"analysis": analysis_text, "visualization_recommendations": viz_recommendations}
+            })
             
             results["generated_files"].append(summary_filepath)
-            print(f"📋 Executive summary saved to: {summary_filepath}")
-            
-            # Generate follow-up study suggestions
-            print("🔬 Generating follow-up study suggestions...")
-            follow_up = self.claude_client.suggest_follow_up_studies(clinical_data)
-            
-            followup_filename = f"follow_up_studies_{timestamp}.txt"
-            followup_filepath = os.path.join(self.output_dir, followup_filename)
-            
-            with open(followup_filepath, 'w', encoding='utf-8') as f:
-                f.write("FOLLOW-UP STUDY RECOMMENDATIONS\n")
-                f.write("=" * 40 + "\n\n")
-                f.write(follow_up)
+            artifacts.append({"artifact": "executive_summary", "path": summary_filepath, "data": exec_summary})
+            log.info(f"📋 Executive summary saved to: {summary_filepath}")
             
             results["generated_files"].append(followup_filepath)
-            print(f"🔬 Follow-up suggestions saved to: {followup_filepath}")
-            
-        except Exception as e:
-            print(f"❌ Error in Claude analysis: {str(e)}")
-            # Continue with visualization even if Claude analysis fails
+            artifacts.append({"artifact": "follow_up_studies", "path": followup_filepath, "data": follow_up})
+            log.info(f"🔬 Follow-up suggestions saved to: {followup_filepath}")
         
         # Step 3: Generate visualizations and exports
-        print("\n📊 STEP 3: Generating visualizations and exports...")
-        try:
-            # Save clinical data as CSV
-            csv_file = self.analyzer.save_clinical_data_csv(clinical_data)
-            results["generated_files"].append(csv_file)
-            
-            # Generate all visualizations
-            chart_files = self.analyzer.generate_all_visualizations(
-                clinical_data, viz_recommendations
-            )
-            results["generated_files"].extend(chart_files)
-            
-            # Create summary dashboard
-            dashboard_file = self.analyzer.create_summary_dashboard(clinical_data)
-            results["generated_files"].append(dashboard_file)
-            
-            print("✅ Visualization generation completed")
-            
-        except Exception as e:
-            print(f"❌ Error in visualization generation: {str(e)}")
+        log.info("📊 STEP 3: Generating visualizations and exports...")
+        if charts_stage is not None:
+            results["generated_files"].extend(charts_stage.output_paths)
+            log.info("♻️  Chart inputs unchanged, reusing previous charts")
+        else:
+            try:
+                chart_files = await charts_task
+                results["generated_files"].extend(chart_files)
+                manifest.record("charts", charts_hash, chart_files)
+            except Exception as e:
+                log.error(f"❌ Error in visualization generation: {str(e)}")
+        
+        # Custom charts follow Claude's recommendations, so they render last
+        custom_hash = stage_hash({
+            "clinical_data": clinical_data,
+            "visualization_recommendations": viz_recommendations,
+            "analyzer": self.analyzer_fingerprint
+        })
+        stage = None if force else manifest.reusable("custom_charts", custom_hash)
+        if stage is not None:
+            results["generated_files"].extend(stage.output_paths)
+            log.info("♻️  Recommendations unchanged, reusing previous custom charts")
+        else:
+            try:
+                custom_files = await asyncio.to_thread(
+                    self._render_custom_charts, clinical_data, viz_recommendations, timestamp
+                )
+                results["generated_files"].extend(custom_files)
+                manifest.record("custom_charts", custom_hash, custom_files)
+            except Exception as e:
+                log.error(f"❌ Error in custom visualization generation: {str(e)}")
+        
+        log.info("✅ Visualization generation completed")
         
         # Step 4: Create final summary
-        print("\n📋 STEP 4: Creating final summary...")
+        log.info("📋 STEP 4: Creating final summary...")
         try:
             summary_data = {
                 "analysis_summary": {
@@ -210,50 +403,260 @@ class ClinicalTrialPipeline:
                     "total_files_generated": len(results["generated_files"])
                 },
                 "generated_files": results["generated_files"],
-                "clinical_data_summary": {
-                    key: str(value)[:100] + "..." if len(str(value)) > 100 else str(value)
-                    for key, value in clinical_data.items()
-                }
+                "clinical_data_summary": dict(zip(
+                    clinical_data.keys(), map(_truncate, map(str, clinical_data.values()))
+                ))
             }
             
             summary_json_filename = f"analysis_summary_{timestamp}.json"
             summary_json_filepath = os.path.join(self.output_dir, summary_json_filename)
             
-            with open(summary_json_filepath, 'w', encoding='utf-8') as f:
-                json.dump(summary_data, f, indent=2, ensure_ascii=False)
-            
+            # Serialize before registering the file so the summary does not list itself
+            pending_writes.append(
+                asyncio.create_task(_write_file(summary_json_filepath, _json_bytes(summary_data)))
+            )
             results["generated_files"].append(summary_json_filepath)
-            print(f"📋 Final summary saved to: {summary_json_filepath}")
+            artifacts.append({"artifact": "analysis_summary", "path": summary_json_filepath, "data": summary_data})
+            
+            # One record per artifact for downstream tooling
+            results_filepath = os.path.join(self.output_dir, f"results_{timestamp}.jsonl")
+            results_jsonl = b"".join(_json_bytes(record, indent=False) + b"\n" for record in artifacts)
+            pending_writes.append(asyncio.create_task(_write_file(results_filepath, results_jsonl)))
+            results["generated_files"].append(results_filepath)
             
         except Exception as e:
-            print(f"⚠️ Error creating final summary: {str(e)}")
+            log.warning(f"⚠️ Error creating final summary: {str(e)}")
+        
+        # Wait for all deferred writes so disk latency overlaps
+        for outcome in await asyncio.gather(*pending_writes, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                log.warning(f"⚠️ Error writing output file: {str(outcome)}")
+            else:
+                log.debug(f"💾 Saved: {outcome}")
+        
+        try:
+            await asyncio.to_thread(manifest.save)
+        except OSError as e:
+            log.warning(f"⚠️ Error saving run manifest: {str(e)}")
         
         return results
     
-    def print_results_summary(self, results: Dict[str, Any]):
-        """Print a summary of the analysis results."""
-        print("\n" + "="*60)
-        print("🎉 ANALYSIS COMPLETE!")
-        print("="*60)
+    def _render_charts(self, clinical_data: Dict[str, Any], timestamp: str) -> List[str]:
+        """Write the CSV export, standard charts and dashboard; runs in a worker thread."""
+        chart_files = [
+            self.analyzer.save_clinical_data_csv(clinical_data, f"clinical_trial_data_{timestamp}.csv")
+        ]
+        chart_files.extend(self.analyzer.generate_standard_visualizations(clinical_data, run_id=timestamp))
+        chart_files.append(self.analyzer.create_summary_dashboard(clinical_data, run_id=timestamp))
+        return chart_files
+    
+    def _render_custom_charts(self, clinical_data: Dict[str, Any],
+                              viz_recommendations: Optional[Dict[str, Any]], timestamp: str) -> List[str]:
+        """Write the charts Claude recommended; runs in a worker thread."""
+        return self.analyzer.generate_custom_visualizations(
+            clinical_data, viz_recommendations, run_id=timestamp
+        )
+    
+    async def _aextract(self, pdf_path: str, pdf_digest: str,
+                        log: logging.LoggerAdapter) -> Dict[str, Any]:
+        """Return the extracted clinical data for a PDF, from the extraction cache if possible."""
+        clinical_data = self.extraction_cache.get(pdf_digest)
+        if clinical_data is not None:
+            log.info("♻️  Reusing cached extraction for identical PDF")
+            return clinical_data
         
-        clinical_data = results.get("clinical_data", {})
+        clinical_data = await self.cerebras_client.aparse_clinical_trial_pdf(pdf_path)
         if clinical_data:
-            print(f"\n📊 Study Title: {clinical_data.get('title', 'Unknown')}")
-            print(f"👥 Participants: {clinical_data.get('participants', 'Unknown')}")
-            print(f"🔬 Study Type: {clinical_data.get('study_type', 'Unknown')}")
+            await asyncio.to_thread(self.extraction_cache.set, pdf_digest, clinical_data)
+        return clinical_data
+    
+    async def _aprefetch_batch_analyses(self, pdf_paths: List[str], concurrency: int, force: bool):
+        """
+        Extract every PDF, then run all Claude analyses as one Message Batches request.
+        
+        The batch results land in the response cache, so the per-PDF runs that follow
+        pick them up instead of making their own analysis calls.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        
+        async def _clinical_data(pdf_path: str) -> Optional[Dict[str, Any]]:
+            log = logging.LoggerAdapter(logger, {"pdf": pdf_path})
+            async with semaphore:
+                try:
+                    pdf_digest = await asyncio.to_thread(self.extraction_cache.digest_for, pdf_path)
+                    if not force:
+                        stage = RunManifest(self.manifest_dir, pdf_digest).reusable(
+                            "extraction", stage_hash({"pdf": pdf_digest})
+                        )
+                        if stage is not None:
+                            return stage.payload
+                    return await self._aextract(pdf_path, pdf_digest, log)
+                except Exception as e:
+                    log.error(f"❌ Error in Cerebras analysis: {str(e)}")
+                    return None
+        
+        datasets = await asyncio.gather(*[_clinical_data(path) for path in pdf_paths])
+        datasets = [data for data in datasets if data]
+        if not datasets:
+            return
+        
+        logger.info(f"📦 Submitting {len(datasets)} Claude analyses as one batch...")
+        try:
+            await asyncio.to_thread(self.claude_client.batch_analyze, datasets)
+        except Exception as e:
+            # Fall back to per-PDF analysis calls
+            logger.error(f"❌ Claude batch analysis failed: {str(e)}")
+    
+    async def _run_claude_stage(self, clinical_data: Dict[str, Any], timestamp: str,
+                                results: Dict[str, Any], log: logging.LoggerAdapter):
+        """
+        Run the Claude analysis, executive summary and follow-up suggestions and write
+        the three reports.
+        
+        Returns:
+            Tuple of (report_path, summary_path, followup_path, analysis_text,
+            executive_summary, follow_up)
+        """
+        # Follow-up suggestions run alongside the analysis; the summary follows it
+        log.info("🔬 Generating analysis, executive summary and follow-up study suggestions...")
+        analysis_text, viz_recommendations, exec_summary, follow_up = \
+            await self.claude_client.run_all(clinical_data)
+        results["claude_analysis"] = analysis_text
+        results["visualization_recommendations"] = viz_recommendations
+        log.info("✅ Claude analysis, executive summary and follow-up suggestions completed")
+        
+        summary_filename = f"executive_summary_{timestamp}.txt"
+        summary_filepath = os.path.join(self.output_dir, summary_filename)
+        followup_filename = f"follow_up_studies_{timestamp}.txt"
+        followup_filepath = os.path.join(self.output_dir, followup_filename)
+        
+        # The three reports are independent, so write them concurrently
+        report_file, _, _ = await asyncio.gather(
+            asyncio.to_thread(
+                self.analyzer.save_analysis_report,
+                analysis_text, f"clinical_analysis_report_{timestamp}.txt"
+            ),
+            asyncio.to_thread(
+                _write_report, summary_filepath, "EXECUTIVE SUMMARY", _SUMMARY_RULE, exec_summary
+            ),
+            asyncio.to_thread(
+                _write_report, followup_filepath, "FOLLOW-UP STUDY RECOMMENDATIONS", _FOLLOWUP_RULE, follow_up
+            )
+        )
+        
+        return report_file, summary_filepath, followup_filepath, analysis_text, exec_summary, follow_up
+    
+    async def aprocess_batch(self, pdf_paths: List[str], concurrency: int = 4,
+                             force: bool = False, claude_batch: bool = False) -> List[Dict[str, Any]]:
+        """
+        Process several PDFs concurrently, sharing this pipeline's clients.
         
-        files_generated = results.get("generated_files", [])
-        print(f"\n📁 Generated {len(files_generated)} output files:")
-        for i, filepath in enumerate(files_generated, 1):
-            filename = os.path.basename(filepath)
-            print(f"   {i:2d}. {filename}")
+        Args:
+            pdf_paths: Paths to the clinical trial PDF files
+            concurrency: Maximum number of PDFs analyzed at the same time
+            force: Rerun every stage even if the manifest says it is up to date
+            claude_batch: Submit all Claude analyses as one Message Batches request
+                (cheaper, but waits for the whole batch) before the per-PDF runs
+            
+        Returns:
+            List of per-PDF results (in input order); failed PDFs map to an
+            entry with an "error" key
+        """
+        if claude_batch:
+            await self._aprefetch_batch_analyses(pdf_paths, concurrency, force)
+        
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+        tag_results = len(pdf_paths) > 1
         
-        print(f"\n💾 All files saved to: {os.path.abspath(self.output_dir)}")
-        print("\n✨ Clinical Trial Copilot analysis complete!")
+        async def _process_one(index: int, pdf_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                run_tag = f"{index + 1:02d}" if tag_results else None
+                try:
+                    return await self.aprocess_clinical_trial(pdf_path, run_tag=run_tag, force=force)
+                except Exception as e:
+                    logger.error(f"❌ Failed to analyze {pdf_path}: {str(e)}", extra={"pdf": pdf_path})
+                    return {"input_file": pdf_path, "error": str(e), "generated_files": []}
+        
+        return await asyncio.gather(
+            *[_process_one(i, path) for i, path in enumerate(pdf_paths)]
+        )
+    
+    def print_results_summary(self, results: Dict[str, Any]):
+        """Log a summary of the analysis results as a single record."""
+        log_results_summary(results, self.output_dir)
 
 
-def main():
-    """Main entry point for the Clinical Trial Copilot."""
+def log_results_summary(results: Dict[str, Any], output_dir: str):
+    """Log a summary of one PDF's analysis results as a single record."""
+    lines = ["", "=" * 60, "🎉 ANALYSIS COMPLETE!", "=" * 60]
+    
+    clinical_data = results.get("clinical_data", {})
+    if clinical_data:
+        lines.append(f"\n📊 Study Title: {clinical_data.get('title', 'Unknown')}")
+        lines.append(f"👥 Participants: {clinical_data.get('participants', 'Unknown')}")
+        lines.append(f"🔬 Study Type: {clinical_data.get('study_type', 'Unknown')}")
+    
+    files_generated = results.get("generated_files", [])
+    lines.append(f"\n📁 Generated {len(files_generated)} output files:")
+    for i, filepath in enumerate(files_generated, 1):
+        filename = os.path.basename(filepath)
+        lines.append(f"   {i:2d}. {filename}")
+    
+    lines.append(f"\n💾 All files saved to: {os.path.abspath(output_dir)}")
+    lines.append("\n✨ Clinical Trial Copilot analysis complete!")
+    logger.info("\n".join(lines))
+
+
+async def run_batch(pipeline: ClinicalTrialPipeline, pdf_paths: List[str],
+                    concurrency: int = 4, force: bool = False,
+                    claude_batch: bool = False) -> List[Dict[str, Any]]:
+    """Process PDFs concurrently inside the pipeline's shared HTTP client lifecycle."""
+    async with pipeline:
+        return await pipeline.aprocess_batch(pdf_paths, concurrency, force=force, claude_batch=claude_batch)
+
+
+async def run_remote(server_url: str, pdf_paths: List[str], concurrency: int = 4,
+                     force: bool = False) -> List[Dict[str, Any]]:
+    """
+    Hand PDFs to a running API server (src/api.py) instead of starting a pipeline here.
+    
+    The server keeps its clients, connection pool and caches warm across requests, so
+    repeated CLI invocations skip the import and client setup cost. The paths are sent
+    as absolute paths and must lie inside the server's LOCAL_PDF_ROOT (data/ by default).
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    endpoint = f"{server_url.rstrip('/')}/analyze/path"
+    
+    async with httpx.AsyncClient(timeout=None) as client:
+        async def _submit(pdf_path: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    response = await client.post(
+                        endpoint, json={"pdf_path": os.path.abspath(pdf_path), "force": force}
+                    )
+                    response.raise_for_status()
+                    return response.json()["results"]
+                except (httpx.HTTPError, KeyError, ValueError) as e:
+                    logger.error(f"❌ Failed to analyze {pdf_path}: {str(e)}", extra={"pdf": pdf_path})
+                    return {"input_file": pdf_path, "error": str(e), "generated_files": []}
+        
+        return await asyncio.gather(*[_submit(path) for path in pdf_paths])
+
+
+def expand_pdf_paths(patterns: List[str]) -> List[str]:
+    """Expand glob patterns into a de-duplicated list of paths, preserving order."""
+    paths = []
+    for pattern in patterns:
+        matches = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+        for path in matches:
+            if path not in paths:
+                paths.append(path)
+    return paths
+
+
+@functools.cache
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser once per process."""
     parser = argparse.ArgumentParser(
         description="Clinical Trial Copilot - Analyze clinical trial PDFs with AI",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -261,12 +664,16 @@ def main():
 Examples:
   python main.py data/trial_report.pdf
   python main.py data/trial_report.pdf --output custom_output/
+  python main.py data/*.pdf --concurrency 4
+  python main.py data/*.pdf --claude-batch
+  python main.py data/*.pdf --server http://localhost:8000
         """
     )
     
     parser.add_argument(
         "pdf_path",
-        help="Path to the clinical trial PDF file to analyze"
+        nargs="+",
+        help="Path(s) or glob pattern(s) of the clinical trial PDF files to analyze"
     )
     
     parser.add_argument(
@@ -275,41 +682,86 @@ Examples:
         help="Output directory for generated files (default: outputs)"
     )
     
+    parser.add_argument(
+        "--concurrency", "-c",
+        type=int,
+        default=4,
+        help="Maximum number of PDFs analyzed concurrently (default: 4)"
+    )
+    
+    parser.add_argument(
+        "--force", "-f",
+        action="store_true",
+        help="Rerun every stage even if its inputs are unchanged since the last run"
+    )
+    
+    parser.add_argument(
+        "--claude-batch",
+        action="store_true",
+        help="Run the Claude analyses of all PDFs as one Message Batches request (50%% cheaper, slower)"
+    )
+    
+    parser.add_argument(
+        "--server",
+        metavar="URL",
+        help="Send the PDFs to a running API server (e.g. http://localhost:8000) instead of analyzing locally"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
         help="Enable verbose logging"
     )
     
-    args = parser.parse_args()
+    return parser
+
+
+def main():
+    """Main entry point for the Clinical Trial Copilot."""
+    args = build_parser().parse_args()
+    setup_logging(args.verbose)
     
-    # Validate input file
-    if not os.path.exists(args.pdf_path):
-        print(f"❌ Error: PDF file not found: {args.pdf_path}")
+    pdf_paths = expand_pdf_paths(args.pdf_path)
+    if not pdf_paths:
+        logger.error(f"❌ Error: No PDF files matched: {' '.join(args.pdf_path)}")
         sys.exit(1)
     
-    if not args.pdf_path.lower().endswith('.pdf'):
-        print(f"❌ Error: File must be a PDF: {args.pdf_path}")
-        sys.exit(1)
+    # Validate input files
+    for pdf_path in pdf_paths:
+        if not os.path.exists(pdf_path):
+            logger.error(f"❌ Error: PDF file not found: {pdf_path}")
+            sys.exit(1)
+        
+        if not pdf_path.lower().endswith('.pdf'):
+            logger.error(f"❌ Error: File must be a PDF: {pdf_path}")
+            sys.exit(1)
     
     try:
+        if args.server:
+            # Thin-client mode: the server owns the pipeline and its warm clients
+            all_results = asyncio.run(run_remote(args.server, pdf_paths, args.concurrency, force=args.force))
+            for results in all_results:
+                files = results.get("generated_files")
+                log_results_summary(results, os.path.dirname(files[0]) if files else args.output)
+            return
+        
         # Initialize pipeline
         pipeline = ClinicalTrialPipeline(output_dir=args.output)
         
-        # Process the clinical trial
-        results = pipeline.process_clinical_trial(args.pdf_path)
+        # Process the clinical trial(s)
+        all_results = asyncio.run(run_batch(
+            pipeline, pdf_paths, args.concurrency, force=args.force, claude_batch=args.claude_batch
+        ))
         
         # Print summary
-        pipeline.print_results_summary(results)
+        for results in all_results:
+            pipeline.print_results_summary(results)
         
     except KeyboardInterrupt:
-        print("\n\n⏹️  Analysis interrupted by user")
+        logger.warning("\n\n⏹️  Analysis interrupted by user")
         sys.exit(1)
     except Exception as e:
-        print(f"\n❌ Unexpected error: {str(e)}")
-        if args.verbose:
-            import traceback
-            traceback.print_exc()
+        logger.error(f"\n❌ Unexpected error: {str(e)}", exc_info=args.verbose)
         sys.exit(1)
 
 
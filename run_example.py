@@ -5,12 +5,13 @@ Demonstrates how to use the system programmatically.
 
 import os
 import sys
+import asyncio
 from dotenv import load_dotenv
 
 # Add src to path for imports
 sys.path.append('src')
 
-from main import ClinicalTrialPipeline
+from main import ClinicalTrialPipeline, run_batch
 
 
 def run_example():
@@ -41,21 +42,22 @@ def run_example():
         print("   python main.py path/to/your/clinical_trial.pdf")
         return False
     
-    # Use the first PDF file found
-    pdf_file = example_files[0]
-    print(f"📄 Found example file: {pdf_file}")
+    print(f"📄 Found {len(example_files)} example file(s):")
+    for pdf_file in example_files:
+        print(f"   - {pdf_file}")
     
     try:
         # Initialize the pipeline
         print("🔧 Initializing Clinical Trial Copilot...")
         pipeline = ClinicalTrialPipeline(output_dir="example_outputs")
         
-        # Run the analysis
-        print(f"🚀 Starting analysis of: {pdf_file}")
-        results = pipeline.process_clinical_trial(pdf_file)
+        # Run the analyses concurrently
+        print(f"🚀 Starting analysis of {len(example_files)} file(s)")
+        all_results = asyncio.run(run_batch(pipeline, example_files))
         
         # Print summary
-        pipeline.print_results_summary(results)
+        for results in all_results:
+            pipeline.print_results_summary(results)
         
         print("\n✨ Example analysis completed successfully!")
         print("📁 Check the 'example_outputs' directory for all generated files.")
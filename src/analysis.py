@@ -3,116 +3,294 @@ Analysis module for generating visualizations and data exports from clinical tri
 """
 
 import os
+import ast
+import csv
 import json
-import pandas as pd
-import matplotlib.pyplot as plt
-import matplotlib.patches as mpatches
-from typing import Dict, Any, List, Optional
+import textwrap
+import threading
+import functools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from typing import Dict, Any, Iterator, List, Mapping, Optional, Tuple
 from datetime import datetime
 import re
 import numpy as np
 
 
+def new_run_id() -> str:
+    """Timestamp used to tie together the files written by one analysis run."""
+    return datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+_figure_api_cache = None
+
+
+def _figure_api():
+    """
+    Import matplotlib's object-oriented figure API on first use, so CSV export and
+    the text helpers don't load matplotlib. pyplot is never imported: its global
+    figure registry would serialize concurrent chart rendering.
+    """
+    global _figure_api_cache
+    if _figure_api_cache is None:
+        import matplotlib
+        import matplotlib.style
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+        _apply_style(matplotlib)
+        _figure_api_cache = (Figure, FigureCanvasAgg)
+    return _figure_api_cache
+
+
+def _apply_style(mpl):
+    """Set the chart style once per process rather than on every analyzer construction."""
+    mpl.style.use('default')
+    mpl.rcParams['figure.figsize'] = (10, 6)
+    mpl.rcParams['font.size'] = 10
+    mpl.rcParams['axes.grid'] = True
+    mpl.rcParams['grid.alpha'] = 0.3
+    # constrained_layout already fits each figure, so skip the tight-bbox re-render on save
+    mpl.rcParams['savefig.bbox'] = 'standard'
+
+
+def _new_figure(figsize: tuple, layout: Optional[str] = "constrained"):
+    """
+    Create an Agg-backed figure for one chart.
+    
+    The constrained layout engine replaces a tight_layout() pass per chart; pass
+    layout=None for figures that place everything in figure coordinates.
+    """
+    Figure, FigureCanvasAgg = _figure_api()
+    fig = Figure(figsize=figsize, layout=layout)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+# Numbers including percentages, decimals, and scientific notation
+_NUM_RE = re.compile(r'-?\d+\.?\d*(?:[eE][+-]?\d+)?%?')
+
+# Filename sanitizer: drop ASCII punctuation and control characters, spaces become underscores
+_FILENAME_TRANS = str.maketrans({
+    chr(i): None for i in range(128) if not (chr(i).isalnum() or chr(i) in " -_")
+})
+_FILENAME_TRANS[ord(' ')] = '_'
+
+_METHODOLOGY_DEFAULTS = ('N/A', 'N/A')
+
+# Last-resort extraction from methodology strings that are neither JSON nor Python literals
+_STUDY_DESIGN_RE = re.compile(r"study_design:\s*([^,}]+)")
+_METHODOLOGY_RE = re.compile(r"methodology:\s*([^,}]+)")
+
+# A brace block with no nested braces
+_BRACE_RE = re.compile(r'\{[^{}]*\}')
+
+
+def _first_brace_block(text: str) -> Optional[str]:
+    """Return the first balanced {...} block in text, or None if it is never closed."""
+    start = text.find('{')
+    if start == -1:
+        return None
+    
+    # Common case: the first block has no nested braces
+    match = _BRACE_RE.match(text, start)
+    if match:
+        return match.group()
+    
+    # Nested braces: jump between brace positions rather than scanning each character
+    depth = 0
+    pos = start
+    while True:
+        close_pos = text.find('}', pos)
+        if close_pos == -1:
+            return None
+        open_pos = text.find('{', pos, close_pos)
+        if open_pos != -1:
+            depth += 1
+            pos = open_pos + 1
+        else:
+            depth -= 1
+            pos = close_pos + 1
+            if depth == 0:
+                return text[start:pos]
+
+
+@functools.lru_cache(maxsize=1024)
+def _parse_dict_string(text: str) -> Optional[Mapping[str, Any]]:
+    """
+    Parse a brace-delimited dictionary string from the extraction step into a read-only mapping.
+    
+    Python literals are parsed whole. For malformed strings only the first key: value
+    pair is kept, cut at the first comma. Returns None when nothing dictionary-like is found.
+    """
+    try:
+        data = ast.literal_eval(text)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        inner = text.strip()[1:-1]
+        colon_pos = inner.find(':')
+        if colon_pos <= 0:
+            return None
+        key = inner[:colon_pos].strip().strip("'\"")
+        value = inner[colon_pos+1:].strip().strip("'\"")
+        if ',' in value:
+            value = value[:value.find(',')].strip()
+        return MappingProxyType({key: value})
+    return MappingProxyType(data) if isinstance(data, dict) else None
+
+
+def _parse_methodology(value: Any, defaults: Tuple[str, str] = _METHODOLOGY_DEFAULTS) -> Optional[Tuple[Any, Any]]:
+    """
+    Return (study_design, methodology) from a methodology dict or dictionary string,
+    filling missing keys from defaults. Returns None for plain-text methodology.
+    """
+    if isinstance(value, dict):
+        return value.get('study_design', defaults[0]), value.get('methodology', defaults[1])
+    if isinstance(value, str):
+        return _parse_methodology_string(value.strip(), defaults)
+    return None
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_methodology_string(text: str, defaults: Tuple[str, str]) -> Optional[Tuple[Any, Any]]:
+    """
+    Cached string path of _parse_methodology, shared by the CSV export and the timeline chart.
+    
+    The string is read as JSON, then as a Python literal; a parsed dict fills missing
+    keys from defaults. Otherwise both keys must be found by pattern, or None is
+    returned so callers keep the raw text.
+    """
+    if not (text.startswith('{') and text.endswith('}')):
+        return None
+    
+    for parse in (json.loads, ast.literal_eval):
+        try:
+            data = parse(text)
+        except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+            continue
+        if isinstance(data, dict):
+            return data.get('study_design', defaults[0]), data.get('methodology', defaults[1])
+        return None
+    
+    study_design_match = _STUDY_DESIGN_RE.search(text)
+    methodology_match = _METHODOLOGY_RE.search(text)
+    if study_design_match and methodology_match:
+        return study_design_match.group(1), methodology_match.group(1)
+    return None
+
+
 class ClinicalTrialAnalyzer:
     """Analyzer for creating visualizations and exports from clinical trial data."""
     
+    # Individual charts are intermediate artifacts; only the dashboard is print quality
+    CHART_DPI = 150
+    DASHBOARD_DPI = 300
+    # Idle figures kept per layout; enough for the standard charts rendering at once
+    FIGURES_PER_LAYOUT = 3
+    # Characters per line in the dashboard text panels
+    _DASHBOARD_WRAP = 70
+    
     def __init__(self, output_dir: str = "outputs"):
         """Initialize the analyzer with output directory."""
         self.output_dir = output_dir
         self._ensure_output_dir()
         
-        # Set matplotlib style
-        plt.style.use('default')
-        plt.rcParams['figure.figsize'] = (10, 6)
-        plt.rcParams['font.size'] = 10
-        plt.rcParams['axes.grid'] = True
-        plt.rcParams['grid.alpha'] = 0.3
+        # Figures are reused across charts of the same layout instead of rebuilt each
+        # time. A figure is checked out while one chart draws on it and returned once the
+        # chart is saved, so charts can render concurrently from any thread; a figure
+        # that is never returned (the chart failed) is simply garbage collected.
+        self._figures_lock = threading.Lock()
+        self._free_figures: Dict[tuple, List[Any]] = {}
+        self._figures_out = weakref.WeakKeyDictionary()
+        
+        # The standard charts are independent, so they render in parallel
+        self._chart_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="chart")
     
     def _ensure_output_dir(self):
         """Ensure output directory exists."""
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir)
+        os.makedirs(self.output_dir, exist_ok=True)
+    
+    def _get_fig(self, nrows: int, ncols: int, figsize: tuple):
+        """
+        Return a cleared cached figure with fresh axes for the given layout.
+        
+        Figures use constrained_layout, so no tight_layout pass is needed per chart.
+        """
+        fig = self._get_blank_fig(figsize, (nrows, ncols))
+        return fig, fig.subplots(nrows, ncols)
     
-    def _clean_dictionary_string(self, text: str, max_length: int = 200) -> str:
+    def _get_blank_fig(self, figsize: tuple, layout: tuple = (0, 0)):
+        """Check out a cleared cached figure, laid out for a (nrows, ncols) grid of axes."""
+        key = layout + (figsize,)
+        with self._figures_lock:
+            free = self._free_figures.get(key)
+            fig = free.pop() if free else None
+        if fig is None:
+            # Without axes there is nothing for a layout engine to solve
+            fig = _new_figure(figsize, "constrained" if layout != (0, 0) else None)
+        else:
+            fig.clear()
+        with self._figures_lock:
+            self._figures_out[fig] = key
+        return fig
+    
+    def _release_fig(self, fig):
+        """Return a checked-out figure for reuse, keeping at most FIGURES_PER_LAYOUT per layout."""
+        with self._figures_lock:
+            key = self._figures_out.pop(fig, None)
+            if key is None:
+                return
+            free = self._free_figures.setdefault(key, [])
+            if len(free) < self.FIGURES_PER_LAYOUT:
+                free.append(fig)
+    
+    def _save_png(self, fig, filepath: str, dpi: int):
+        """Save a figure as PNG with fast zlib compression; slightly larger files, far less encode CPU."""
+        fig.savefig(filepath, dpi=dpi, pil_kwargs={"compress_level": 1, "optimize": False})
+        self._release_fig(fig)
+    
+    def close(self):
+        """Stop the chart worker threads and drop the cached figures."""
+        self._chart_pool.shutdown(wait=True)
+        with self._figures_lock:
+            self._free_figures.clear()
+    
+    @staticmethod
+    def _clean_dictionary_string(text: str, max_length: int = 200) -> str:
         """Clean up dictionary strings and extract readable content."""
         if not isinstance(text, str):
             return str(text)
         
+        # Most fields are plain prose: truncate without stripping, parsing or caching
+        if '{' not in text or '}' not in text:
+            return text if len(text) <= max_length else text[:max_length] + "..."
+        
+        return ClinicalTrialAnalyzer._clean_text(text, max_length)
+    
+    @staticmethod
+    def _readable_pairs(data: Mapping[str, Any], max_length: int) -> str:
+        """Join key-value pairs as readable text, truncated to max_length."""
+        result = '; '.join(f"{str(key).replace('_', ' ').title()}: {value}" for key, value in data.items())
+        if len(result) > max_length:
+            return result[:max_length] + "..."
+        return result
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _clean_text(text: str, max_length: int) -> str:
+        """Cached body of _clean_dictionary_string for strings containing braces."""
         # If it's a dictionary string, try to extract readable content
-        if text.strip().startswith('{') and text.strip().endswith('}'):
-            try:
-                import ast
-                data = ast.literal_eval(text)
-                if isinstance(data, dict):
-                    # Extract key-value pairs as readable text
-                    readable_parts = []
-                    for key, value in data.items():
-                        readable_parts.append(f"{key.replace('_', ' ').title()}: {value}")
-                    result = '; '.join(readable_parts)
-                    # Truncate if too long
-                    if len(result) > max_length:
-                        return result[:max_length] + "..."
-                    return result
-            except (ValueError, SyntaxError):
-                # For malformed dictionary strings, extract the first meaningful part
-                # Remove the outer braces and extract the first key-value pair
-                inner = text.strip()[1:-1]  # Remove { and }
-                # Find the first colon to separate key from value
-                colon_pos = inner.find(':')
-                if colon_pos > 0:
-                    key = inner[:colon_pos].strip().strip("'\"")
-                    value = inner[colon_pos+1:].strip().strip("'\"")
-                    # Remove any trailing comma or other characters
-                    if ',' in value:
-                        value = value[:value.find(',')].strip()
-                    result = f"{key.replace('_', ' ').title()}: {value}"
-                    if len(result) > max_length:
-                        return result[:max_length] + "..."
-                    return result
+        stripped = text.strip()
+        if stripped[0] == '{' and stripped[-1] == '}':
+            data = _parse_dict_string(stripped)
+            if data is not None:
+                return ClinicalTrialAnalyzer._readable_pairs(data, max_length)
         
         # If it contains multiple dictionary strings, extract the first one
-        if '{' in text and '}' in text:
-            # Find the first complete dictionary string
-            start = text.find('{')
-            if start != -1:
-                brace_count = 0
-                end = start
-                for i, char in enumerate(text[start:], start):
-                    if char == '{':
-                        brace_count += 1
-                    elif char == '}':
-                        brace_count -= 1
-                        if brace_count == 0:
-                            end = i + 1
-                            break
-                
-                if end > start:
-                    dict_str = text[start:end]
-                    # Process the extracted string
-                    try:
-                        import ast
-                        data = ast.literal_eval(dict_str)
-                        if isinstance(data, dict):
-                            readable_parts = []
-                            for key, value in data.items():
-                                readable_parts.append(f"{key.replace('_', ' ').title()}: {value}")
-                            result = '; '.join(readable_parts)
-                            if len(result) > max_length:
-                                return result[:max_length] + "..."
-                            return result
-                    except (ValueError, SyntaxError):
-                        # For malformed dictionary strings, extract the first meaningful part
-                        inner = dict_str.strip()[1:-1]  # Remove { and }
-                        colon_pos = inner.find(':')
-                        if colon_pos > 0:
-                            key = inner[:colon_pos].strip().strip("'\"")
-                            value = inner[colon_pos+1:].strip().strip("'\"")
-                            if ',' in value:
-                                value = value[:value.find(',')].strip()
-                            result = f"{key.replace('_', ' ').title()}: {value}"
-                            if len(result) > max_length:
-                                return result[:max_length] + "..."
-                            return result
+        dict_str = _first_brace_block(text)
+        if dict_str:
+            data = _parse_dict_string(dict_str)
+            if data is not None:
+                return ClinicalTrialAnalyzer._readable_pairs(data, max_length)
         
         # Truncate if too long
         if len(text) > max_length:
@@ -120,133 +298,81 @@ class ClinicalTrialAnalyzer:
         
         return text
     
-    def save_clinical_data_csv(self, clinical_data: Dict[str, Any], filename: str = None) -> str:
+    def save_clinical_data_csv(self, clinical_data: Dict[str, Any], filename: str = None,
+                               run_id: Optional[str] = None) -> str:
         """Save clinical trial data as CSV file."""
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"clinical_trial_data_{timestamp}.csv"
+            filename = f"clinical_trial_data_{run_id or new_run_id()}.csv"
         
         filepath = os.path.join(self.output_dir, filename)
         
-        # Convert nested data to flat structure for CSV
-        flattened_data = []
+        with open(filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(('Field', 'Value'))
+            writer.writerows(self._iter_csv_rows(clinical_data))
+        
+        print(f"📊 Clinical data saved to: {filepath}")
+        return filepath
+    
+    @staticmethod
+    def _iter_csv_rows(clinical_data: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
+        """Flatten nested clinical data into (field, value) rows for the CSV export."""
         for key, value in clinical_data.items():
             # Handle dictionary values properly
             if isinstance(value, dict):
                 # For methodology dict, extract individual components
                 if key == 'methodology' and 'study_design' in value and 'methodology' in value:
-                    flattened_data.append({
-                        'Field': 'Study Design',
-                        'Value': value.get('study_design', 'N/A')
-                    })
-                    flattened_data.append({
-                        'Field': 'Methodology',
-                        'Value': value.get('methodology', 'N/A')
-                    })
+                    yield 'Study Design', value.get('study_design', 'N/A')
+                    yield 'Methodology', value.get('methodology', 'N/A')
                 else:
                     # For other dicts, create separate rows for each key
                     for sub_key, sub_value in value.items():
-                        flattened_data.append({
-                            'Field': f"{key.replace('_', ' ').title()} - {sub_key.replace('_', ' ').title()}",
-                            'Value': str(sub_value)
-                        })
-            elif isinstance(value, str) and key == 'methodology' and value.strip().startswith('{') and value.strip().endswith('}'):
-                # Handle string representation of methodology dictionary
-                try:
-                    import ast
-                    methodology_dict = ast.literal_eval(value)
-                    if isinstance(methodology_dict, dict):
-                        flattened_data.append({
-                            'Field': 'Study Design',
-                            'Value': methodology_dict.get('study_design', 'N/A')
-                        })
-                        flattened_data.append({
-                            'Field': 'Methodology',
-                            'Value': methodology_dict.get('methodology', 'N/A')
-                        })
-                    else:
-                        flattened_data.append({
-                            'Field': key.replace('_', ' ').title(),
-                            'Value': str(value)
-                        })
-                except (ValueError, SyntaxError):
-                    # Try to extract values using regex if ast.literal_eval fails
-                    import re
-                    study_design_match = re.search(r"study_design:\s*([^,}]+)", value)
-                    methodology_match = re.search(r"methodology:\s*([^,}]+)", value)
-                    
-                    if study_design_match and methodology_match:
-                        flattened_data.append({
-                            'Field': 'Study Design',
-                            'Value': study_design_match.group(1)
-                        })
-                        flattened_data.append({
-                            'Field': 'Methodology',
-                            'Value': methodology_match.group(1)
-                        })
-                    else:
-                        flattened_data.append({
-                            'Field': key.replace('_', ' ').title(),
-                            'Value': str(value)
-                        })
+                        yield f"{key.replace('_', ' ').title()} - {sub_key.replace('_', ' ').title()}", str(sub_value)
+            elif key == 'methodology' and isinstance(value, str) and (parsed := _parse_methodology(value)):
+                # String representation of the methodology dictionary
+                yield 'Study Design', parsed[0]
+                yield 'Methodology', parsed[1]
             else:
-                flattened_data.append({
-                    'Field': key.replace('_', ' ').title(),
-                    'Value': str(value)
-                })
-        
-        df = pd.DataFrame(flattened_data)
-        df.to_csv(filepath, index=False)
-        
-        print(f"📊 Clinical data saved to: {filepath}")
-        return filepath
+                yield key.replace('_', ' ').title(), str(value)
     
-    def save_analysis_report(self, analysis_text: str, filename: str = None) -> str:
+    def save_analysis_report(self, analysis_text: str, filename: str = None,
+                             run_id: Optional[str] = None) -> str:
         """Save analysis report as text file."""
         if filename is None:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"clinical_analysis_report_{timestamp}.txt"
+            filename = f"clinical_analysis_report_{run_id or new_run_id()}.txt"
         
         filepath = os.path.join(self.output_dir, filename)
         
+        report = (
+            "CLINICAL TRIAL ANALYSIS REPORT\n"
+            f"{'=' * 50}\n\n"
+            f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+            f"{analysis_text}"
+        )
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write("CLINICAL TRIAL ANALYSIS REPORT\n")
-            f.write("=" * 50 + "\n\n")
-            f.write(f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n")
-            f.write(analysis_text)
+            f.write(report)
         
         print(f"📋 Analysis report saved to: {filepath}")
         return filepath
     
-    def extract_numeric_data(self, text: str) -> List[float]:
-        """Extract numeric values from text for visualization."""
-        # Find numbers including percentages, decimals, and scientific notation
-        pattern = r'-?\d+\.?\d*(?:[eE][+-]?\d+)?%?'
-        matches = re.findall(pattern, text)
-        
-        numbers = []
-        for match in matches:
-            try:
-                # Remove percentage sign and convert
-                clean_num = match.replace('%', '')
-                numbers.append(float(clean_num))
-            except ValueError:
-                continue
-        
-        return numbers
+    def extract_numeric_data(self, text: str) -> np.ndarray:
+        """Extract numeric values from text for visualization, as a float64 array."""
+        # Every match is a valid float literal once the percentage sign is removed;
+        # NumPy parses the whole list in C rather than one float() call per match
+        return np.array([m.rstrip('%') for m in _NUM_RE.findall(text)], dtype=np.float64)
     
-    def create_efficacy_chart(self, clinical_data: Dict[str, Any]) -> str:
+    def create_efficacy_chart(self, clinical_data: Dict[str, Any], run_id: Optional[str] = None) -> str:
         """Create efficacy/results visualization."""
-        fig, ax = plt.subplots(figsize=(12, 8))
+        fig, ax = self._get_fig(1, 1, (12, 8))
         
         # Extract data from results summary
         results_text = clinical_data.get('results_summary', '')
         numbers = self.extract_numeric_data(results_text)
         
-        if numbers and len(numbers) >= 2:
+        if numbers.size >= 2:
             # Create comparison chart
             categories = ['Control Group', 'Treatment Group', 'Difference']
-            values = numbers[:3] if len(numbers) >= 3 else numbers + [abs(numbers[1] - numbers[0]) if len(numbers) >= 2 else 0]
+            values = numbers[:3] if numbers.size >= 3 else np.append(numbers, abs(numbers[1] - numbers[0]))
             
             bars = ax.bar(categories, values[:len(categories)], 
                          color=['#ff7f7f', '#7fbf7f', '#7f7fff'], alpha=0.8)
@@ -254,7 +380,7 @@ class ClinicalTrialAnalyzer:
             # Add value labels on bars
             for bar, value in zip(bars, values[:len(categories)]):
                 height = bar.get_height()
-                ax.text(bar.get_x() + bar.get_width()/2., height + max(values) * 0.01,
+                ax.text(bar.get_x() + bar.get_width()/2., height + values.max() * 0.01,
                        f'{value:.1f}', ha='center', va='bottom', fontweight='bold')
             
             ax.set_title('Clinical Trial Efficacy Results', fontsize=16, fontweight='bold')
@@ -275,21 +401,18 @@ class ClinicalTrialAnalyzer:
             ax.set_ylim(0, 1)
             ax.axis('off')
         
-        plt.tight_layout()
-        
         # Save chart
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = run_id or new_run_id()
         filename = f"efficacy_chart_{timestamp}.png"
         filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_png(fig, filepath, self.CHART_DPI)
         
         print(f"📈 Efficacy chart saved to: {filepath}")
         return filepath
     
-    def create_safety_profile_chart(self, clinical_data: Dict[str, Any]) -> str:
+    def create_safety_profile_chart(self, clinical_data: Dict[str, Any], run_id: Optional[str] = None) -> str:
         """Create adverse events/safety profile visualization."""
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = self._get_fig(1, 1, (10, 8))
         
         adverse_events = clinical_data.get('adverse_events', '')
         
@@ -320,21 +443,19 @@ class ClinicalTrialAnalyzer:
         ax.legend(wedges, ae_categories, title="Severity Levels", 
                  loc="center left", bbox_to_anchor=(1, 0, 0.5, 1))
         
-        plt.tight_layout()
-        
         # Save chart
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = run_id or new_run_id()
         filename = f"safety_profile_{timestamp}.png"
         filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_png(fig, filepath, self.CHART_DPI)
         
         print(f"🛡️ Safety profile chart saved to: {filepath}")
         return filepath
     
-    def create_study_timeline_chart(self, clinical_data: Dict[str, Any]) -> str:
-        """Create study timeline and methodology visualization."""
-        fig, ax = plt.subplots(figsize=(14, 6))
+    def _build_timeline_figure(self):
+        """Build the static part of the timeline chart; returns (fig, ax, methodology text artist)."""
+        fig = _new_figure((14, 6))
+        ax = fig.subplots()
         
         # Common clinical trial phases
         phases = ['Screening', 'Baseline', 'Treatment Period', 'Follow-up', 'Analysis']
@@ -350,43 +471,9 @@ class ClinicalTrialAnalyzer:
                        fontsize=10, fontweight='bold',
                        bbox=dict(boxstyle="round,pad=0.3", facecolor="lightblue"))
         
-        # Add methodology information
-        methodology = clinical_data.get('methodology', 'Standard clinical trial design')
-        
-        # Handle case where methodology is a dictionary or string representation of dictionary
-        if isinstance(methodology, dict):
-            study_design = methodology.get('study_design', 'Cross-sectional survey')
-            methodology_text = methodology.get('methodology', 'Multivariable logistic regression')
-            display_text = f"Study Design: {study_design}\nMethodology: {methodology_text}"
-        elif isinstance(methodology, str) and methodology.strip().startswith('{') and methodology.strip().endswith('}'):
-            # Handle string representation of dictionary
-            try:
-                import ast
-                methodology_dict = ast.literal_eval(methodology)
-                if isinstance(methodology_dict, dict):
-                    study_design = methodology_dict.get('study_design', 'Cross-sectional survey')
-                    methodology_text = methodology_dict.get('methodology', 'Multivariable logistic regression')
-                    display_text = f"Study Design: {study_design}\nMethodology: {methodology_text}"
-                else:
-                    display_text = f"Study Design: {methodology}"
-            except (ValueError, SyntaxError):
-                # Try to extract values using regex if ast.literal_eval fails
-                import re
-                study_design_match = re.search(r"study_design:\s*([^,}]+)", methodology)
-                methodology_match = re.search(r"methodology:\s*([^,}]+)", methodology)
-                
-                if study_design_match and methodology_match:
-                    study_design = study_design_match.group(1)
-                    methodology_text = methodology_match.group(1)
-                    display_text = f"Study Design: {study_design}\nMethodology: {methodology_text}"
-                else:
-                    display_text = f"Study Design: {methodology}"
-        else:
-            display_text = f"Study Design: {methodology}"
-        
-        ax.text(0.5, 0.3, display_text, 
-               transform=ax.transAxes, ha='center', va='center',
-               fontsize=12, bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow"))
+        methodology_label = ax.text(0.5, 0.3, "", 
+                                   transform=ax.transAxes, ha='center', va='center',
+                                   fontsize=12, bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow"))
         
         ax.set_xlim(-1, 16)
         ax.set_ylim(0, 2)
@@ -395,59 +482,103 @@ class ClinicalTrialAnalyzer:
         ax.set_yticks([])
         ax.grid(True, alpha=0.3)
         
-        plt.tight_layout()
+        return fig, ax, methodology_label
+    
+    def create_study_timeline_chart(self, clinical_data: Dict[str, Any], run_id: Optional[str] = None) -> str:
+        """Create study timeline and methodology visualization."""
+        # The phase line and labels never change, so the figure is built once and only
+        # the methodology text is updated on later calls
+        cache = self._fig_cache()
+        if "timeline" not in cache:
+            cache["timeline"] = self._build_timeline_figure()
+        fig, _, methodology_label = cache["timeline"]
+        
+        # Add methodology information
+        methodology = clinical_data.get('methodology', 'Standard clinical trial design')
+        
+        # Handle case where methodology is a dictionary or string representation of dictionary
+        parsed = _parse_methodology(methodology, ('Cross-sectional survey', 'Multivariable logistic regression'))
+        if parsed:
+            display_text = f"Study Design: {parsed[0]}\nMethodology: {parsed[1]}"
+        else:
+            display_text = f"Study Design: {methodology}"
+        
+        methodology_label.set_text(display_text)
         
         # Save chart
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = run_id or new_run_id()
         filename = f"study_timeline_{timestamp}.png"
         filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_png(fig, filepath, self.CHART_DPI)
         
         print(f"⏱️ Study timeline chart saved to: {filepath}")
         return filepath
     
     def generate_all_visualizations(self, clinical_data: Dict[str, Any], 
-                                   viz_recommendations: Dict[str, Any] = None) -> List[str]:
-        """Generate all standard clinical trial visualizations."""
+                                   viz_recommendations: Dict[str, Any] = None,
+                                   run_id: Optional[str] = None) -> List[str]:
+        """
+        Generate all standard clinical trial visualizations.
+        
+        run_id, when given, replaces the timestamp in the chart filenames so that
+        concurrent analyses writing to the same output directory do not collide.
+        """
         print("📊 Generating clinical trial visualizations...")
         
+        # One timestamp for the whole batch so the chart filenames pair up
+        run_id = run_id or new_run_id()
+        chart_files = self.generate_standard_visualizations(clinical_data, run_id)
+        chart_files.extend(self.generate_custom_visualizations(clinical_data, viz_recommendations, run_id))
+        
+        print(f"✅ Generated {len(chart_files)} visualization files")
+        return chart_files
+    
+    def generate_standard_visualizations(self, clinical_data: Dict[str, Any],
+                                         run_id: Optional[str] = None) -> List[str]:
+        """Generate the efficacy, safety and timeline charts, which only need the extracted data."""
+        run_id = run_id or new_run_id()
         chart_files = []
         
-        # Generate standard charts
-        try:
-            chart_files.append(self.create_efficacy_chart(clinical_data))
-        except Exception as e:
-            print(f"⚠️ Error creating efficacy chart: {str(e)}")
+        jobs = [
+            (self.create_efficacy_chart, "efficacy chart"),
+            (self.create_safety_profile_chart, "safety profile chart"),
+            (self.create_study_timeline_chart, "timeline chart"),
+        ]
+        futures = [(self._chart_pool.submit(create, clinical_data, run_id), label) for create, label in jobs]
         
-        try:
-            chart_files.append(self.create_safety_profile_chart(clinical_data))
-        except Exception as e:
-            print(f"⚠️ Error creating safety profile chart: {str(e)}")
+        # Collect in submission order so the file list stays stable
+        for future, label in futures:
+            try:
+                chart_files.append(future.result())
+            except Exception as e:
+                print(f"⚠️ Error creating {label}: {str(e)}")
         
-        try:
-            chart_files.append(self.create_study_timeline_chart(clinical_data))
-        except Exception as e:
-            print(f"⚠️ Error creating timeline chart: {str(e)}")
+        return chart_files
+    
+    def generate_custom_visualizations(self, clinical_data: Dict[str, Any],
+                                       viz_recommendations: Dict[str, Any] = None,
+                                       run_id: Optional[str] = None) -> List[str]:
+        """Generate custom charts based on Claude's recommendations."""
+        run_id = run_id or new_run_id()
+        chart_files = []
         
-        # Generate custom charts based on Claude's recommendations
         if viz_recommendations and 'visualizations' in viz_recommendations:
             for viz in viz_recommendations['visualizations']:
                 try:
-                    custom_chart = self.create_custom_visualization(clinical_data, viz)
+                    custom_chart = self.create_custom_visualization(clinical_data, viz, run_id)
                     if custom_chart:
                         chart_files.append(custom_chart)
                 except Exception as e:
                     print(f"⚠️ Error creating custom visualization: {str(e)}")
         
-        print(f"✅ Generated {len(chart_files)} visualization files")
         return chart_files
     
     def create_custom_visualization(self, clinical_data: Dict[str, Any], 
-                                   viz_spec: Dict[str, Any]) -> Optional[str]:
+                                   viz_spec: Dict[str, Any],
+                                   run_id: Optional[str] = None) -> Optional[str]:
         """Create custom visualization based on Claude's recommendations."""
         try:
-            fig, ax = plt.subplots(figsize=(10, 6))
+            fig, ax = self._get_fig(1, 1, (10, 6))
             
             viz_type = viz_spec.get('type', 'bar_chart')
             title = viz_spec.get('title', 'Custom Visualization')
@@ -457,13 +588,13 @@ class ClinicalTrialAnalyzer:
             source_text = clinical_data.get(data_source, '')
             numbers = self.extract_numeric_data(source_text)
             
-            if viz_type == 'bar_chart' and numbers:
+            if viz_type == 'bar_chart' and numbers.size:
                 categories = [f'Group {i+1}' for i in range(len(numbers[:5]))]
                 ax.bar(categories, numbers[:5], color='steelblue', alpha=0.7)
                 ax.set_ylabel(viz_spec.get('y_label', 'Value'))
                 ax.set_xlabel(viz_spec.get('x_label', 'Category'))
                 
-            elif viz_type == 'line_chart' and numbers:
+            elif viz_type == 'line_chart' and numbers.size:
                 time_points = list(range(len(numbers[:10])))
                 ax.plot(time_points, numbers[:10], 'o-', linewidth=2, markersize=6)
                 ax.set_ylabel(viz_spec.get('y_label', 'Value'))
@@ -479,15 +610,13 @@ class ClinicalTrialAnalyzer:
                 ax.axis('off')
             
             ax.set_title(title, fontsize=14, fontweight='bold')
-            plt.tight_layout()
             
             # Save chart
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            safe_title = re.sub(r'[^\w\s-]', '', title).strip().replace(' ', '_')
+            timestamp = run_id or new_run_id()
+            safe_title = title.translate(_FILENAME_TRANS).strip('_')
             filename = f"custom_{safe_title}_{timestamp}.png"
             filepath = os.path.join(self.output_dir, filename)
-            plt.savefig(filepath, dpi=300, bbox_inches='tight')
-            plt.close()
+            self._save_png(fig, filepath, self.CHART_DPI)
             
             print(f"🎨 Custom visualization saved to: {filepath}")
             return filepath
@@ -496,9 +625,11 @@ class ClinicalTrialAnalyzer:
             print(f"⚠️ Error creating custom visualization: {str(e)}")
             return None
     
-    def create_summary_dashboard(self, clinical_data: Dict[str, Any]) -> str:
+    def create_summary_dashboard(self, clinical_data: Dict[str, Any], run_id: Optional[str] = None) -> str:
         """Create a summary dashboard with key metrics."""
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+        # The panels are only titled text boxes, so draw them straight onto the figure
+        # instead of building four axes and hiding them
+        fig = self._get_blank_fig((16, 12))
         fig.suptitle(f"Clinical Trial Dashboard: {clinical_data.get('title', 'Unknown Study')}", 
                     fontsize=16, fontweight='bold')
         
@@ -509,44 +640,34 @@ class ClinicalTrialAnalyzer:
             f"Participants: {clinical_data.get('participants', 'N/A')}",
             f"Primary Endpoint: {endpoints_clean}"
         ]
-        ax1.text(0.1, 0.7, '\n'.join(study_info), transform=ax1.transAxes, 
-                fontsize=11, verticalalignment='top',
-                bbox=dict(boxstyle="round,pad=0.5", facecolor="lightblue"))
-        ax1.set_title('Study Overview', fontweight='bold')
-        ax1.axis('off')
         
         # Top-right: Results summary
         results = self._clean_dictionary_string(clinical_data.get('results_summary', 'No results available'), 200)
-        ax2.text(0.1, 0.9, results, transform=ax2.transAxes, 
-                fontsize=10, verticalalignment='top', wrap=True,
-                bbox=dict(boxstyle="round,pad=0.5", facecolor="lightgreen"))
-        ax2.set_title('Key Results', fontweight='bold')
-        ax2.axis('off')
         
         # Bottom-left: Safety data
         safety = self._clean_dictionary_string(clinical_data.get('adverse_events', 'No safety data available'), 200)
-        ax3.text(0.1, 0.9, safety, transform=ax3.transAxes, 
-                fontsize=10, verticalalignment='top', wrap=True,
-                bbox=dict(boxstyle="round,pad=0.5", facecolor="lightyellow"))
-        ax3.set_title('Safety Profile', fontweight='bold')
-        ax3.axis('off')
         
         # Bottom-right: Statistical analysis
         stats = self._clean_dictionary_string(clinical_data.get('statistical_analysis', 'No statistical data available'), 200)
-        ax4.text(0.1, 0.9, stats, transform=ax4.transAxes, 
-                fontsize=10, verticalalignment='top', wrap=True,
-                bbox=dict(boxstyle="round,pad=0.5", facecolor="lightcoral"))
-        ax4.set_title('Statistical Analysis', fontweight='bold')
-        ax4.axis('off')
         
-        plt.tight_layout()
+        # (title, body, panel left, panel top, box color, font size) in figure coordinates
+        panels = [
+            ('Study Overview', '\n'.join(study_info), 0.03, 0.90, "lightblue", 11),
+            ('Key Results', results, 0.53, 0.90, "lightgreen", 10),
+            ('Safety Profile', safety, 0.03, 0.46, "lightyellow", 10),
+            ('Statistical Analysis', stats, 0.53, 0.46, "lightcoral", 10),
+        ]
+        for title, body, left, top, color, fontsize in panels:
+            fig.text(left + 0.22, top, title, ha='center', va='bottom', fontsize=12, fontweight='bold')
+            wrapped = '\n'.join(textwrap.fill(line, self._DASHBOARD_WRAP) for line in body.splitlines())
+            fig.text(left + 0.02, top - 0.04, wrapped, ha='left', va='top', fontsize=fontsize,
+                    bbox=dict(boxstyle="round,pad=0.5", facecolor=color))
         
         # Save dashboard
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        timestamp = run_id or new_run_id()
         filename = f"clinical_dashboard_{timestamp}.png"
         filepath = os.path.join(self.output_dir, filename)
-        plt.savefig(filepath, dpi=300, bbox_inches='tight')
-        plt.close()
+        self._save_png(fig, filepath, self.DASHBOARD_DPI)
         
         print(f"📊 Clinical dashboard saved to: {filepath}")
         return filepath
@@ -571,14 +692,16 @@ def test_analyzer():
             "statistical_analysis": "Chi-square test for categorical variables, p-value = 0.001, CI 95%"
         }
         
+        run_id = new_run_id()
+        
         print("📊 Testing visualization generation...")
-        charts = analyzer.generate_all_visualizations(sample_data)
+        charts = analyzer.generate_all_visualizations(sample_data, run_id=run_id)
         
         print("📋 Testing CSV export...")
-        csv_file = analyzer.save_clinical_data_csv(sample_data)
+        csv_file = analyzer.save_clinical_data_csv(sample_data, run_id=run_id)
         
         print("📊 Testing dashboard creation...")
-        dashboard = analyzer.create_summary_dashboard(sample_data)
+        dashboard = analyzer.create_summary_dashboard(sample_data, run_id=run_id)
         
         print(f"✅ Generated {len(charts)} charts, 1 CSV file, and 1 dashboard")
         return True
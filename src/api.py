@@ -6,8 +6,11 @@ Optional API interface for the clinical trial analysis pipeline.
 import os
 import sys
 import json
+import time
+import asyncio
 import tempfile
-from typing import Dict, Any, List
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime
 from fastapi import FastAPI, File, UploadFile, HTTPException, BackgroundTasks
 from fastapi.responses import JSONResponse, FileResponse
@@ -21,6 +24,7 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 # Import our pipeline
 from main import ClinicalTrialPipeline
+from src.llm_cache import copy_with_digest
 
 
 # Load environment variables
@@ -51,6 +55,43 @@ app.mount("/outputs", StaticFiles(directory="outputs"), name="outputs")
 # Global pipeline instance
 pipeline = None
 
+# Background task that periodically evicts expired Cerebras chunk results
+cache_cleanup_task = None
+CACHE_CLEANUP_INTERVAL = 300
+
+# Block size used when copying uploads to disk
+UPLOAD_COPY_BUFSIZE = 1024 * 1024
+
+# Uploads at least this large are analyzed in the background
+LARGE_FILE_THRESHOLD = 10 * 1024 * 1024
+
+# /analyze/path only reads PDFs inside this directory (the project's data/ by default)
+LOCAL_PDF_ROOT = os.path.realpath(os.getenv(
+    "LOCAL_PDF_ROOT",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+))
+
+# Caps how many PDFs are analyzed at once so concurrent uploads cannot exhaust memory
+analysis_semaphore = asyncio.Semaphore(int(os.getenv("MAX_CONCURRENT_ANALYSES", "4")))
+
+
+def declared_upload_size(file: UploadFile) -> Optional[int]:
+    """Size of an upload as known before reading it, or None if neither source reports one."""
+    size = getattr(file, "size", None)
+    if size is not None:
+        return size
+    
+    try:
+        return int(file.headers.get("content-length"))
+    except (TypeError, ValueError):
+        return None
+
+
+async def run_analysis(pdf_path: str, force: bool = False) -> Dict[str, Any]:
+    """Run the pipeline on a PDF, waiting for a free analysis slot first."""
+    async with analysis_semaphore:
+        return await pipeline.aprocess_clinical_trial(pdf_path, force=force)
+
 # Pydantic models for API responses
 class AnalysisStatus(BaseModel):
     """Model for analysis status responses."""
@@ -71,6 +112,12 @@ class AnalysisResult(BaseModel):
     status: str = "completed"
 
 
+class PathAnalysisRequest(BaseModel):
+    """Model for analyzing a PDF that is already on the server's filesystem."""
+    pdf_path: str
+    force: bool = False
+
+
 class HealthCheck(BaseModel):
     """Model for health check responses."""
     status: str
@@ -79,22 +126,163 @@ class HealthCheck(BaseModel):
     services: Dict[str, str]
 
 
+def generated_files(analysis: Dict[str, Any]) -> List[str]:
+    """Return the output files of a completed analysis."""
+    if analysis.get("status") != "completed" or "results" not in analysis:
+        return []
+    return analysis["results"].get("generated_files", [])
+
+
+def delete_generated_files(analysis: Dict[str, Any], keep: frozenset = frozenset()):
+    """Remove the output files of a completed analysis from disk, except those in keep."""
+    for file_path in generated_files(analysis):
+        if file_path in keep:
+            continue
+        try:
+            if os.path.exists(file_path):
+                os.unlink(file_path)
+        except Exception as e:
+            print(f"Warning: Could not delete file {file_path}: {str(e)}")
+
+
+class AnalysisStore:
+    """
+    Bounded in-memory store of analysis records with LRU eviction.
+    
+    Records expire time_to_live seconds after they are created, or time_to_idle seconds
+    after they were last read or updated (0 disables either limit). Expired, evicted
+    and deleted analyses have their generated files removed, except files another live
+    record still lists: the pipeline reuses a previous run's outputs for an identical
+    PDF, so several analyses can share the same report and chart files. Records still
+    processing are never evicted for capacity, so background tasks can always update them.
+    """
+    
+    def __init__(self, max_entries: int = 1000, time_to_live: float = 86400, time_to_idle: float = 0):
+        self.max_entries = max_entries
+        self.time_to_live = time_to_live
+        self.time_to_idle = time_to_idle
+        # analysis_id -> [created_at, last_access, record], least recently used first
+        self._entries: "OrderedDict[str, list]" = OrderedDict()
+    
+    def _expired(self, entry: list, now: float) -> bool:
+        created_at, last_access, _ = entry
+        if self.time_to_live and now - created_at > self.time_to_live:
+            return True
+        return bool(self.time_to_idle) and now - last_access > self.time_to_idle
+    
+    def _discard(self, analysis_id: str):
+        _, _, record = self._entries.pop(analysis_id)
+        # Files of analyses still in progress are not listed yet; those runs write or
+        # reuse them later, and the run manifest re-renders outputs that went missing
+        in_use = frozenset(
+            file_path
+            for _, _, other in self._entries.values()
+            for file_path in generated_files(other)
+        )
+        delete_generated_files(record, keep=in_use)
+    
+    def purge_expired(self):
+        """Drop every expired record."""
+        now = time.monotonic()
+        for analysis_id in [k for k, entry in self._entries.items() if self._expired(entry, now)]:
+            self._discard(analysis_id)
+    
+    def get(self, analysis_id: str) -> Optional[Dict[str, Any]]:
+        """Return a record and mark it recently used, or None if missing or expired."""
+        entry = self._entries.get(analysis_id)
+        if entry is None:
+            return None
+        
+        now = time.monotonic()
+        if self._expired(entry, now):
+            self._discard(analysis_id)
+            return None
+        
+        entry[1] = now
+        self._entries.move_to_end(analysis_id)
+        return entry[2]
+    
+    def __contains__(self, analysis_id: str) -> bool:
+        return self.get(analysis_id) is not None
+    
+    def __getitem__(self, analysis_id: str) -> Dict[str, Any]:
+        record = self.get(analysis_id)
+        if record is None:
+            raise KeyError(analysis_id)
+        return record
+    
+    def __setitem__(self, analysis_id: str, record: Dict[str, Any]):
+        now = time.monotonic()
+        entry = self._entries.get(analysis_id)
+        if entry is not None:
+            # Updates keep the original creation time for time-to-live
+            entry[1:] = [now, record]
+            self._entries.move_to_end(analysis_id)
+        else:
+            self._entries[analysis_id] = [now, now, record]
+        
+        self.purge_expired()
+        if len(self._entries) > self.max_entries:
+            evictable = [k for k, entry in self._entries.items() if entry[2].get("status") != "processing"]
+            for old_id in evictable[:len(self._entries) - self.max_entries]:
+                self._discard(old_id)
+    
+    def __delitem__(self, analysis_id: str):
+        """Remove a record and the generated files no other record shares."""
+        if analysis_id not in self._entries:
+            raise KeyError(analysis_id)
+        self._discard(analysis_id)
+    
+    def __len__(self) -> int:
+        self.purge_expired()
+        return len(self._entries)
+    
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Return (analysis_id, record) pairs without affecting recency."""
+        self.purge_expired()
+        return [(analysis_id, entry[2]) for analysis_id, entry in self._entries.items()]
+
+
 # Global storage for analysis results (in production, use a database)
-analysis_results: Dict[str, Dict[str, Any]] = {}
+analysis_results = AnalysisStore(
+    max_entries=int(os.getenv("ANALYSIS_STORE_MAX_ENTRIES", "1000")),
+    time_to_live=float(os.getenv("ANALYSIS_TIME_TO_LIVE_SECONDS", "86400")),
+    time_to_idle=float(os.getenv("ANALYSIS_TIME_TO_IDLE_SECONDS", "0"))
+)
+
+
+async def cleanup_result_cache():
+    """Drop expired Cerebras chunk results every CACHE_CLEANUP_INTERVAL seconds."""
+    while True:
+        await asyncio.sleep(CACHE_CLEANUP_INTERVAL)
+        if pipeline and pipeline.cerebras_client:
+            pipeline.cerebras_client.result_cache.cleanup_expired()
 
 
 @app.on_event("startup")
 async def startup_event():
     """Initialize the pipeline on startup."""
-    global pipeline
+    global pipeline, cache_cleanup_task
     try:
         pipeline = ClinicalTrialPipeline()
+        await pipeline.__aenter__()
+        cache_cleanup_task = asyncio.create_task(cleanup_result_cache())
         print("✅ FastAPI: Clinical Trial Copilot pipeline initialized")
     except Exception as e:
         print(f"❌ FastAPI: Failed to initialize pipeline: {str(e)}")
         pipeline = None
 
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop cache cleanup and release the pipeline's pooled HTTP connections on shutdown."""
+    if cache_cleanup_task:
+        cache_cleanup_task.cancel()
+    if pipeline:
+        await pipeline.aclose()
+        pipeline.cerebras_client.close()
+
+
 @app.get("/", response_model=HealthCheck)
 async def root():
     """Root endpoint with API information."""
@@ -116,6 +304,18 @@ async def health_check():
     return await root()
 
 
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit/miss counters and memory usage of the Cerebras chunk result cache."""
+    if not pipeline or not pipeline.cerebras_client:
+        raise HTTPException(
+            status_code=503,
+            detail="Clinical Trial Copilot pipeline not available. Check service health."
+        )
+    
+    return pipeline.cerebras_client.result_cache.stats()
+
+
 @app.post("/analyze", response_model=Dict[str, Any])
 async def analyze_clinical_trial(
     background_tasks: BackgroundTasks,
@@ -143,12 +343,20 @@ async def analyze_clinical_trial(
     # Generate unique analysis ID
     analysis_id = f"analysis_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{hash(file.filename) % 10000}"
     
+    # Pick the synchronous or background path from the declared size, before touching
+    # the upload's contents
+    declared_size = declared_upload_size(file)
+    
     try:
-        # Save uploaded file temporarily
+        # Stream the upload (already spooled by Starlette) to a temp file in fixed-size
+        # blocks rather than holding a second full copy of it in memory. The content hash
+        # is computed during the copy so the extraction cache need not re-read the file.
+        await file.seek(0)
         with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as temp_file:
-            content = await file.read()
-            temp_file.write(content)
+            digest = await asyncio.to_thread(copy_with_digest, file.file, temp_file, UPLOAD_COPY_BUFSIZE)
+            file_size = declared_size if declared_size is not None else temp_file.tell()
             temp_file_path = temp_file.name
+        pipeline.extraction_cache.register_digest(temp_file_path, digest)
         
         # Initialize analysis status
         analysis_results[analysis_id] = {
@@ -160,9 +368,9 @@ async def analyze_clinical_trial(
         }
         
         # For small files, process synchronously
-        if len(content) < 10 * 1024 * 1024:  # Less than 10MB
+        if file_size < LARGE_FILE_THRESHOLD:
             try:
-                results = pipeline.process_clinical_trial(temp_file_path)
+                results = await run_analysis(temp_file_path)
                 
                 # Clean up temp file
                 os.unlink(temp_file_path)
@@ -224,6 +432,61 @@ async def analyze_clinical_trial(
         )
 
 
+@app.post("/analyze/path", response_model=Dict[str, Any])
+async def analyze_local_clinical_trial(request: PathAnalysisRequest):
+    """
+    Analyze a clinical trial PDF by path on the server's filesystem.
+    
+    Used by `main.py --server` so that repeated CLI runs reuse this process's warm
+    clients and caches instead of each paying the startup cost. Only PDFs inside
+    LOCAL_PDF_ROOT are accepted (after resolving symlinks), since the response returns
+    the extracted contents to the caller.
+    """
+    if not pipeline:
+        raise HTTPException(
+            status_code=503, 
+            detail="Clinical Trial Copilot pipeline not available. Check service health."
+        )
+    
+    if not request.pdf_path.lower().endswith('.pdf'):
+        raise HTTPException(
+            status_code=400,
+            detail="File must be a PDF document"
+        )
+    
+    pdf_path = os.path.realpath(request.pdf_path)
+    try:
+        inside_root = os.path.commonpath([pdf_path, LOCAL_PDF_ROOT]) == LOCAL_PDF_ROOT
+    except ValueError:
+        # Paths on different drives (Windows) have no common path
+        inside_root = False
+    if not inside_root:
+        raise HTTPException(
+            status_code=403,
+            detail="PDF path is outside the server's data directory"
+        )
+    
+    if not os.path.isfile(pdf_path):
+        raise HTTPException(
+            status_code=404,
+            detail=f"PDF file not found: {request.pdf_path}"
+        )
+    
+    try:
+        results = await run_analysis(pdf_path, force=request.force)
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Analysis failed: {str(e)}"
+        )
+    
+    return {
+        "status": "completed",
+        "message": "Analysis completed successfully",
+        "results": results
+    }
+
+
 async def process_large_file(analysis_id: str, temp_file_path: str, filename: str):
     """Background task for processing large files."""
     try:
@@ -231,7 +494,7 @@ async def process_large_file(analysis_id: str, temp_file_path: str, filename: st
         analysis_results[analysis_id]["progress"] = 25.0
         analysis_results[analysis_id]["message"] = "Processing PDF with Cerebras..."
         
-        results = pipeline.process_clinical_trial(temp_file_path)
+        results = await run_analysis(temp_file_path)
         
         # Clean up temp file
         os.unlink(temp_file_path)
@@ -375,21 +638,7 @@ async def delete_analysis(analysis_id: str):
             detail=f"Analysis ID {analysis_id} not found"
         )
     
-    analysis = analysis_results[analysis_id]
-    
-    # Clean up generated files if analysis completed
-    if analysis["status"] == "completed" and "results" in analysis:
-        results = analysis["results"]
-        generated_files = results.get("generated_files", [])
-        
-        for file_path in generated_files:
-            try:
-                if os.path.exists(file_path):
-                    os.unlink(file_path)
-            except Exception as e:
-                print(f"Warning: Could not delete file {file_path}: {str(e)}")
-    
-    # Remove from memory
+    # Removes the record and any generated files no other analysis shares
     del analysis_results[analysis_id]
     
     return {
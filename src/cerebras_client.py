@@ -3,17 +3,293 @@ Cerebras client for parsing clinical trial PDFs and extracting structured data.
 """
 
 import os
+import re
 import json
+import time
+import asyncio
+import hashlib
+import threading
+import multiprocessing
+import httpx
 import requests
-from typing import Dict, Any, Optional
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from typing import Dict, Any, List, Optional, Iterable, Iterator, Tuple, Union, BinaryIO
 from pypdf import PdfReader
 
 
+EXTRACTION_MODEL = "llama3.1-8b"
+
+# Bump whenever the extraction prompt changes so cached chunk results are not reused
+PROMPT_VERSION = 2
+
+# Maximum number of chunk extraction requests in flight per PDF
+CHUNK_CONCURRENCY = 8
+
+# Number of chunks sent together in one batched extraction request
+EXTRACTION_BATCH_SIZE = 4
+
+# Output token budget per chunk; batched requests scale it by the batch length
+MAX_TOKENS_PER_CHUNK = 2000
+
+_EXTRACTION_FIELDS = """\
+- title: Study title
+- participants: Number and demographics of participants
+- study_type: Type of clinical trial (Phase I/II/III, randomized, etc.)
+- endpoints: Primary and secondary endpoints
+- results_summary: Key findings and results
+- methodology: Study design and methodology
+- adverse_events: Safety data and adverse events
+- statistical_analysis: Statistical methods and significance"""
+
+
+# Regex fallback patterns by result field. Within a field the first pattern (in list
+# order) that matches anywhere in the text wins, so the order is significant.
+_FALLBACK_PATTERNS = {
+    "title": (
+        r"Study Title[:\s]+([^\n]+)",
+        r"Title[:\s]+([^\n]+)",
+        r"Clinical Trial[:\s]+([^\n]+)",
+        r"(?m:^)([A-Z][^.\n]{10,100})\n",  # First line that looks like a title
+    ),
+    "participants": (
+        r"(\d{1,3}(?:,\d{3})*)\s*(?:participants?|patients?|subjects?)",
+        r"(?:participants?|patients?|subjects?)[:\s]+(\d{1,3}(?:,\d{3})*)",
+        r"n\s*=\s*(\d{1,3}(?:,\d{3})*)",
+        r"sample size[:\s]+(\d{1,3}(?:,\d{3})*)",
+    ),
+    "study_type": (
+        r"(Phase\s+[IVX]+)",
+        r"(Randomized\s+[^.\n]*)",
+        r"(Double-blind\s+[^.\n]*)",
+        r"(Placebo-controlled\s+[^.\n]*)",
+        r"(Open-label\s+[^.\n]*)",
+        r"(Pilot\s+[^.\n]*)",
+    ),
+    "endpoints": (
+        r"Primary endpoint[:\s]+([^.\n]+)",
+        r"Primary outcome[:\s]+([^.\n]+)",
+        r"Secondary endpoint[:\s]+([^.\n]+)",
+        r"Secondary outcome[:\s]+([^.\n]+)",
+    ),
+    "results_summary": (
+        r"Results[:\s]+([^.\n]{50,500})",
+        r"Conclusion[:\s]+([^.\n]{50,500})",
+        r"Findings[:\s]+([^.\n]{50,500})",
+        r"Outcome[:\s]+([^.\n]{50,500})",
+    ),
+    "methodology": (
+        r"Method[:\s]+([^.\n]{50,300})",
+        r"Design[:\s]+([^.\n]{50,300})",
+        r"Study design[:\s]+([^.\n]{50,300})",
+    ),
+    "adverse_events": (
+        r"Adverse event[:\s]+([^.\n]{30,300})",
+        r"Safety[:\s]+([^.\n]{30,300})",
+        r"Side effect[:\s]+([^.\n]{30,300})",
+    ),
+    "statistical_analysis": (
+        r"Statistical analysis[:\s]+([^.\n]{30,300})",
+        r"p-value[:\s]+([^.\n]{20,200})",
+        r"Significance[:\s]+([^.\n]{20,200})",
+    ),
+}
+
+
+# Compiled once; each field's patterns are still tried separately, in order, because
+# patterns of different fields can match at the same position
+_FALLBACK_RES = {
+    field: tuple(re.compile(pattern, re.IGNORECASE) for pattern in patterns)
+    for field, patterns in _FALLBACK_PATTERNS.items()
+}
+
+# Start of the next chunk after the whitespace a split was made at
+_NON_SPACE_RE = re.compile(r"\S")
+
+
+# Fields of the merged extraction; the combined ones accumulate text from every chunk
+_MERGE_FIELDS = (
+    "title", "participants", "study_type", "endpoints",
+    "results_summary", "methodology", "adverse_events", "statistical_analysis"
+)
+_COMBINED_MERGE_FIELDS = frozenset({"results_summary", "endpoints", "adverse_events"})
+
+
+# Worker processes for PDF text extraction; also the number of page batches that may be
+# extracted or waiting to be chunked at once
+PDF_POOL_WORKERS = os.cpu_count() or 1
+
+_pdf_pool_executor: Optional[ProcessPoolExecutor] = None
+_pdf_pool_lock = threading.Lock()
+
+
+def _pdf_pool() -> ProcessPoolExecutor:
+    """
+    Return the shared process pool used for PDF text extraction, creating it on first use.
+    
+    Workers are spawned rather than forked: the host process already runs threads
+    (log listener, chart pool, asyncio helpers) and forking while they hold locks can
+    deadlock the child.
+    """
+    global _pdf_pool_executor
+    with _pdf_pool_lock:
+        if _pdf_pool_executor is None:
+            _pdf_pool_executor = ProcessPoolExecutor(
+                max_workers=PDF_POOL_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pdf_pool_executor
+
+
+# The reader a worker process last parsed, as ((path, mtime, size), reader), so the
+# page-range tasks of one document parse it once per worker rather than once per range
+_worker_reader: Optional[tuple] = None
+
+
+def _open_reader(pdf_path: str) -> PdfReader:
+    """Return a PdfReader for pdf_path, reusing this process's last one if the file is unchanged."""
+    global _worker_reader
+    stat = os.stat(pdf_path)
+    key = (os.path.realpath(pdf_path), stat.st_mtime_ns, stat.st_size)
+    if _worker_reader is None or _worker_reader[0] != key:
+        _worker_reader = (key, PdfReader(pdf_path))
+    return _worker_reader[1]
+
+
+def _count_pages(pdf_path: str) -> int:
+    """Return the number of pages in a PDF; runs in a worker process."""
+    try:
+        return len(_open_reader(pdf_path).pages)
+    except Exception as e:
+        raise Exception(f"Error reading PDF: {str(e)}")
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> str:
+    """Extract the text of pages [start, stop) of a PDF; runs in a worker process."""
+    try:
+        reader = _open_reader(pdf_path)
+        return "\n".join(reader.pages[i].extract_text() for i in range(start, stop)).strip()
+    except Exception as e:
+        raise Exception(f"Error reading PDF: {str(e)}")
+
+
+def _split_index(text: str, start: int, max_chunk_size: int) -> int:
+    """
+    Return where a chunk beginning at start should end: the last space or newline
+    within max_chunk_size characters, or a hard split if there is none (e.g. one
+    very long token). Uses str.rfind so no per-word Python loop is needed.
+    """
+    end = start + max_chunk_size
+    split = max(text.rfind(" ", start, end), text.rfind("\n", start, end))
+    return split if split > start else end
+
+
+def _batched(iterable: Iterable[str], size: int) -> Iterator[List[str]]:
+    """Yield consecutive lists of up to size items from an iterable."""
+    batch = []
+    for item in iterable:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _ResultCache:
+    """In-process LRU cache of chunk extraction results with per-entry TTL and a memory cap."""
+
+    def __init__(self, max_size: int = 1000, default_ttl: float = 3600,
+                 max_memory: int = 100 * 1024 * 1024):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self.max_memory = max_memory
+        self._entries: "OrderedDict[str, Tuple[float, int, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_usage = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(model: str, chunk: str) -> str:
+        """Build the cache key for a chunk extracted with the given model and current prompt."""
+        return hashlib.sha256(f"{model}|{PROMPT_VERSION}|{chunk}".encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a copy of the cached result, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[2])
+
+    def put(self, key: str, value: Dict[str, Any], ttl: Optional[float] = None):
+        """Store a result, evicting least recently used entries past the size or memory limits."""
+        size = len(key) + len(json.dumps(value, ensure_ascii=False, default=str))
+        if size > self.max_memory:
+            return
+
+        expires_at = time.monotonic() + (ttl if ttl is not None else self.default_ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (expires_at, size, dict(value))
+            self.memory_usage += size
+
+            while len(self._entries) > self.max_size or self.memory_usage > self.max_memory:
+                self._remove(next(iter(self._entries)))
+
+    def _remove(self, key: str):
+        _, size, _ = self._entries.pop(key)
+        self.memory_usage -= size
+
+    def cleanup_expired(self) -> int:
+        """Drop every expired entry and return how many were removed."""
+        now = time.monotonic()
+        with self._lock:
+            expired = [key for key, (expires_at, _, _) in self._entries.items() if expires_at < now]
+            for key in expired:
+                self._remove(key)
+        return len(expired)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_size": self.max_size,
+                "memory_usage": self.memory_usage,
+                "max_memory": self.max_memory,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+
 class CerebrasClient:
     """Client for interacting with Cerebras API for clinical trial data extraction."""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the Cerebras client with API key."""
+    def __init__(self, api_key: Optional[str] = None, http_client: Optional[httpx.AsyncClient] = None,
+                 result_cache: Optional[_ResultCache] = None):
+        """
+        Initialize the Cerebras client with API key.
+        
+        Args:
+            api_key: Cerebras API key (defaults to CEREBRAS_API_KEY)
+            http_client: Optional shared httpx.AsyncClient used by the async methods
+            result_cache: Optional chunk result cache (a fresh in-process cache by default)
+        """
         self.api_key = api_key or os.getenv("CEREBRAS_API_KEY")
         if not self.api_key:
             raise ValueError("CEREBRAS_API_KEY not found in environment variables")
@@ -24,64 +300,130 @@ class CerebrasClient:
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
+        self.http_client = http_client
+        self.model = EXTRACTION_MODEL
+        self.result_cache = result_cache or _ResultCache()
+        
+        # One pooled keep-alive session for the sync path, so chunks after the first
+        # skip the TCP/TLS handshake; transient failures are retried with backoff
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        retries = Retry(
+            total=3,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=None,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=retries)
+        self._session.mount("https://", adapter)
     
-    def extract_text_from_pdf(self, pdf_path: str) -> str:
-        """Extract text content from PDF file."""
+    def close(self):
+        """Release the pooled connections held by the sync session."""
+        self._session.close()
+    
+    def set_http_client(self, http_client: Optional[httpx.AsyncClient]):
+        """Use a shared httpx.AsyncClient (or None to fall back to requests in a thread)."""
+        self.http_client = http_client
+    
+    def extract_text_from_pdf(self, pdf_path: Union[str, BinaryIO]) -> str:
+        """Extract text content from a PDF file path or a seekable binary stream."""
         try:
             reader = PdfReader(pdf_path)
-            text = ""
-            
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
+            text = "\n".join(page.extract_text() for page in reader.pages)
             
             return text.strip()
         except Exception as e:
             raise Exception(f"Error reading PDF: {str(e)}")
     
+    def iter_chunks(self, pdf_path: Union[str, BinaryIO], max_chunk_size: int = 4000) -> Iterator[str]:
+        """
+        Yield text chunks of at most max_chunk_size characters straight from the PDF's pages.
+        
+        Pages are extracted one at a time into a small buffer that is flushed at the last
+        whitespace before the size limit, so memory stays bounded by one page plus one
+        chunk regardless of the document's length.
+        """
+        try:
+            reader = PdfReader(pdf_path)
+        except Exception as e:
+            raise Exception(f"Error reading PDF: {str(e)}")
+        
+        buffer = ""
+        for page in reader.pages:
+            buffer += (page.extract_text() or "") + "\n"
+            
+            while len(buffer) >= max_chunk_size:
+                split = _split_index(buffer, 0, max_chunk_size)
+                chunk = buffer[:split].strip()
+                buffer = buffer[split:].lstrip()
+                if chunk:
+                    yield chunk
+        
+        tail = buffer.strip()
+        if tail:
+            yield tail
+    
+    def iter_text_chunks(self, text: str, max_chunk_size: int = 4000) -> Iterator[str]:
+        """Yield chunks of at most max_chunk_size characters, split at the last whitespace."""
+        start = 0
+        while True:
+            # Skip the whitespace the previous chunk ended at so it does not take up room
+            match = _NON_SPACE_RE.search(text, start)
+            if match is None:
+                return
+            start = match.start()
+            if len(text) - start <= max_chunk_size:
+                break
+            end = _split_index(text, start, max_chunk_size)
+            yield text[start:end].rstrip()
+            start = end
+        
+        tail = text[start:].strip()
+        if tail:
+            yield tail
+    
     def chunk_text(self, text: str, max_chunk_size: int = 4000) -> list[str]:
         """Split text into manageable chunks for API processing."""
-        words = text.split()
-        chunks = []
-        current_chunk = []
-        current_size = 0
-        
-        for word in words:
-            word_size = len(word) + 1  # +1 for space
-            if current_size + word_size > max_chunk_size and current_chunk:
-                chunks.append(" ".join(current_chunk))
-                current_chunk = [word]
-                current_size = word_size
-            else:
-                current_chunk.append(word)
-                current_size += word_size
-        
-        if current_chunk:
-            chunks.append(" ".join(current_chunk))
-        
-        return chunks
+        return list(self.iter_text_chunks(text, max_chunk_size))
     
-    def extract_clinical_data(self, text_chunk: str) -> Dict[str, Any]:
-        """Send text chunk to Cerebras for structured clinical trial data extraction."""
-        prompt = f"""
-        Extract structured clinical trial information from the following text. 
-        Return a JSON object with the following fields:
-        - title: Study title
-        - participants: Number and demographics of participants
-        - study_type: Type of clinical trial (Phase I/II/III, randomized, etc.)
-        - endpoints: Primary and secondary endpoints
-        - results_summary: Key findings and results
-        - methodology: Study design and methodology
-        - adverse_events: Safety data and adverse events
-        - statistical_analysis: Statistical methods and significance
-        
-        Text to analyze:
-        {text_chunk}
-        
-        Return only valid JSON without any additional text or formatting.
-        """
+    def _build_extraction_payload(self, text_chunk: str) -> Dict[str, Any]:
+        """Build the chat completion payload for structured data extraction."""
+        prompt = f"""Extract structured clinical trial information from the following text.
+Return a JSON object with the following fields:
+{_EXTRACTION_FIELDS}
+
+Text to analyze:
+{text_chunk}
+
+Return only valid JSON without any additional text or formatting."""
+        
+        return {
+            "model": self.model,  # Using available Cerebras model
+            "messages": [
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.1,
+            "max_tokens": MAX_TOKENS_PER_CHUNK
+        }
+    
+    def _build_batch_extraction_payload(self, text_chunks: List[str]) -> Dict[str, Any]:
+        """Build one chat completion payload that extracts several chunks at once."""
+        texts = "\n\n".join(f"TEXT {i}:\n{chunk}" for i, chunk in enumerate(text_chunks, 1))
+        prompt = f"""Extract structured clinical trial information from each of the {len(text_chunks)} texts below.
+Return a JSON array of length {len(text_chunks)} where element i is the result for TEXT i.
+Each element is a JSON object with the following fields:
+{_EXTRACTION_FIELDS}
+
+{texts}
+
+Return only a valid JSON array without any additional text or formatting."""
         
-        payload = {
-            "model": "llama3.1-8b",  # Using available Cerebras model
+        return {
+            "model": self.model,
             "messages": [
                 {
                     "role": "user",
@@ -89,41 +431,221 @@ class CerebrasClient:
                 }
             ],
             "temperature": 0.1,
-            "max_tokens": 2000
+            "max_tokens": MAX_TOKENS_PER_CHUNK * len(text_chunks)
         }
+    
+    def _parse_batch_response(self, status_code: int, response_json, response_text: str,
+                              cache_keys: List[str]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Parse a batched chat completion response into one result per chunk.
+        
+        Returns None if the response is not a JSON array of objects of the expected
+        length, in which case the caller falls back to one request per chunk.
+        """
+        if status_code != 200:
+            print(f"⚠️  Cerebras API error: {status_code} - {response_text}")
+            return None
         
+        # A 200 with a non-JSON or oddly shaped body also falls back to per-chunk requests
         try:
-            response = requests.post(
+            result = response_json()
+            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+            parsed = json.loads(content)
+        except (ValueError, TypeError, AttributeError, IndexError):
+            return None
+        
+        if (not isinstance(parsed, list) or len(parsed) != len(cache_keys)
+                or not all(isinstance(item, dict) for item in parsed)):
+            return None
+        
+        for cache_key, item in zip(cache_keys, parsed):
+            self.result_cache.put(cache_key, item)
+        return parsed
+    
+    def _parse_extraction_response(self, status_code: int, response_json, response_text: str,
+                                   cache_key: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], str]:
+        """
+        Parse a chat completion response.
+        
+        Returns (data, content); data is None when the regex fallback is needed, in which
+        case content is whatever text the model returned.
+        """
+        if status_code == 200:
+            result = response_json()
+            content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
+            
+            # Try to parse JSON from the response
+            try:
+                parsed = json.loads(content)
+            except json.JSONDecodeError:
+                # If JSON parsing fails, the caller extracts data from the text directly
+                return None, content
+            
+            # Only successful API extractions are cached; fallbacks are retried next time
+            if cache_key and isinstance(parsed, dict):
+                self.result_cache.put(cache_key, parsed)
+            return parsed, content
+        
+        print(f"⚠️  Cerebras API error: {status_code} - {response_text}")
+        return None, ""
+    
+    def _handle_extraction_response(self, status_code: int, response_json, response_text: str,
+                                    text_chunk: str, cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Turn a chat completion response into structured data, falling back to regex extraction."""
+        data, content = self._parse_extraction_response(status_code, response_json, response_text, cache_key)
+        if data is None:
+            data = self._extract_data_from_text(text_chunk, content)
+        return data
+    
+    async def _aextract_data_from_text(self, text_chunk: str, api_content: str = "") -> Dict[str, Any]:
+        """Run the regex fallback in the default thread pool so it does not block the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._extract_data_from_text, text_chunk, api_content)
+    
+    def extract_clinical_data(self, text_chunk: str) -> Dict[str, Any]:
+        """Send text chunk to Cerebras for structured clinical trial data extraction."""
+        cache_key = self.result_cache.key(self.model, text_chunk)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        return self._request_clinical_data(text_chunk, cache_key)
+    
+    def _request_clinical_data(self, text_chunk: str, cache_key: str) -> Dict[str, Any]:
+        """Extract one chunk with the API, bypassing the cache lookup."""
+        payload = self._build_extraction_payload(text_chunk)
+        
+        try:
+            response = self._session.post(
                 f"{self.base_url}/chat/completions",
-                headers=self.headers,
                 json=payload,
                 timeout=30
             )
             
-            if response.status_code == 200:
-                result = response.json()
-                content = result.get("choices", [{}])[0].get("message", {}).get("content", "")
-                
-                # Try to parse JSON from the response
-                try:
-                    return json.loads(content)
-                except json.JSONDecodeError:
-                    # If JSON parsing fails, try to extract data from the text directly
-                    return self._extract_data_from_text(text_chunk, content)
-            else:
-                print(f"⚠️  Cerebras API error: {response.status_code} - {response.text}")
-                # Fall back to direct text extraction
-                return self._extract_data_from_text(text_chunk, "")
+            return self._handle_extraction_response(
+                response.status_code, response.json, response.text, text_chunk, cache_key
+            )
                 
         except requests.exceptions.RequestException as e:
             print(f"⚠️  Cerebras API request failed: {str(e)}")
             # Fall back to direct text extraction
             return self._extract_data_from_text(text_chunk, "")
     
-    def _extract_data_from_text(self, text_chunk: str, api_content: str = "") -> Dict[str, Any]:
-        """Fallback method to extract clinical trial data directly from text when API fails."""
-        import re
+    async def aextract_clinical_data(self, text_chunk: str) -> Dict[str, Any]:
+        """Async variant of extract_clinical_data() using the shared httpx client."""
+        if self.http_client is None:
+            return await asyncio.to_thread(self.extract_clinical_data, text_chunk)
+        
+        cache_key = self.result_cache.key(self.model, text_chunk)
+        cached = self.result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        return await self._arequest_clinical_data(text_chunk, cache_key)
+    
+    async def _arequest_clinical_data(self, text_chunk: str, cache_key: str) -> Dict[str, Any]:
+        """Async variant of _request_clinical_data()."""
+        if self.http_client is None:
+            return await asyncio.to_thread(self._request_clinical_data, text_chunk, cache_key)
+        
+        payload = self._build_extraction_payload(text_chunk)
+        
+        try:
+            response = await self.http_client.post(
+                f"{self.base_url}/chat/completions",
+                headers=self.headers,
+                json=payload,
+                timeout=30
+            )
+            
+            data, content = self._parse_extraction_response(
+                response.status_code, response.json, response.text, cache_key
+            )
+            if data is None:
+                data = await self._aextract_data_from_text(text_chunk, content)
+            return data
+                
+        except httpx.HTTPError as e:
+            print(f"⚠️  Cerebras API request failed: {str(e)}")
+            # Fall back to direct text extraction
+            return await self._aextract_data_from_text(text_chunk, "")
+    
+    def extract_clinical_data_batch(self, text_chunks: List[str]) -> List[Dict[str, Any]]:
+        """
+        Extract several chunks with a single Cerebras request, returning results in order.
+        
+        Cached chunks are answered locally. If the batched response is invalid, the
+        remaining chunks are extracted one request at a time.
+        """
+        cache_keys = [self.result_cache.key(self.model, chunk) for chunk in text_chunks]
+        results = [self.result_cache.get(key) for key in cache_keys]
+        missing = [i for i, data in enumerate(results) if data is None]
+        
+        if len(missing) > 1:
+            payload = self._build_batch_extraction_payload([text_chunks[i] for i in missing])
+            try:
+                response = self._session.post(
+                    f"{self.base_url}/chat/completions",
+                    json=payload,
+                    timeout=30 * len(missing)
+                )
+                parsed = self._parse_batch_response(
+                    response.status_code, response.json, response.text, [cache_keys[i] for i in missing]
+                )
+            except requests.exceptions.RequestException as e:
+                print(f"⚠️  Cerebras batch request failed: {str(e)}")
+                parsed = None
+            
+            if parsed is not None:
+                for i, data in zip(missing, parsed):
+                    results[i] = data
+                return results
+            
+            print(f"⚠️  Batched extraction unusable, retrying {len(missing)} chunks individually")
+        
+        for i in missing:
+            results[i] = self._request_clinical_data(text_chunks[i], cache_keys[i])
+        return results
+    
+    async def aextract_clinical_data_batch(self, text_chunks: List[str]) -> List[Dict[str, Any]]:
+        """Async variant of extract_clinical_data_batch() using the shared httpx client."""
+        if self.http_client is None:
+            return await asyncio.to_thread(self.extract_clinical_data_batch, text_chunks)
+        
+        cache_keys = [self.result_cache.key(self.model, chunk) for chunk in text_chunks]
+        results = [self.result_cache.get(key) for key in cache_keys]
+        missing = [i for i, data in enumerate(results) if data is None]
+        
+        if len(missing) > 1:
+            payload = self._build_batch_extraction_payload([text_chunks[i] for i in missing])
+            try:
+                response = await self.http_client.post(
+                    f"{self.base_url}/chat/completions",
+                    headers=self.headers,
+                    json=payload,
+                    timeout=30 * len(missing)
+                )
+                parsed = self._parse_batch_response(
+                    response.status_code, response.json, response.text, [cache_keys[i] for i in missing]
+                )
+            except httpx.HTTPError as e:
+                print(f"⚠️  Cerebras batch request failed: {str(e)}")
+                parsed = None
+            
+            if parsed is not None:
+                for i, data in zip(missing, parsed):
+                    results[i] = data
+                return results
+            
+            print(f"⚠️  Batched extraction unusable, retrying {len(missing)} chunks individually")
         
+        for i in missing:
+            results[i] = await self._arequest_clinical_data(text_chunks[i], cache_keys[i])
+        return results
+    
+    @staticmethod
+    def _extract_data_from_text(text_chunk: str, api_content: str = "") -> Dict[str, Any]:
+        """Fallback method to extract clinical trial data directly from text when API fails."""
         # Initialize result with fallback values
         result = {
             "title": "Unable to extract title",
@@ -136,119 +658,32 @@ class CerebrasClient:
             "statistical_analysis": "Unable to extract statistical analysis"
         }
         
-        # Try to extract title (look for common patterns)
-        title_patterns = [
-            r"Study Title[:\s]+([^\n]+)",
-            r"Title[:\s]+([^\n]+)",
-            r"Clinical Trial[:\s]+([^\n]+)",
-            r"^([A-Z][^.\n]{10,100})\n",  # First line that looks like a title
-        ]
-        
-        for pattern in title_patterns:
-            match = re.search(pattern, text_chunk, re.IGNORECASE | re.MULTILINE)
-            if match:
-                result["title"] = match.group(1).strip()
-                break
-        
-        # Try to extract participant count
-        participant_patterns = [
-            r"(\d{1,3}(?:,\d{3})*)\s*(?:participants?|patients?|subjects?)",
-            r"(?:participants?|patients?|subjects?)[:\s]+(\d{1,3}(?:,\d{3})*)",
-            r"n\s*=\s*(\d{1,3}(?:,\d{3})*)",
-            r"sample size[:\s]+(\d{1,3}(?:,\d{3})*)",
-        ]
-        
-        for pattern in participant_patterns:
-            match = re.search(pattern, text_chunk, re.IGNORECASE)
-            if match:
-                result["participants"] = f"{match.group(1)} participants"
-                break
-        
-        # Try to extract study type/phase
-        phase_patterns = [
-            r"(Phase\s+[IVX]+)",
-            r"(Randomized\s+[^.\n]*)",
-            r"(Double-blind\s+[^.\n]*)",
-            r"(Placebo-controlled\s+[^.\n]*)",
-            r"(Open-label\s+[^.\n]*)",
-            r"(Pilot\s+[^.\n]*)",
-        ]
-        
-        for pattern in phase_patterns:
-            match = re.search(pattern, text_chunk, re.IGNORECASE)
-            if match:
-                result["study_type"] = match.group(1)
-                break
-        
-        # Try to extract endpoints
-        endpoint_patterns = [
-            r"Primary endpoint[:\s]+([^.\n]+)",
-            r"Primary outcome[:\s]+([^.\n]+)",
-            r"Secondary endpoint[:\s]+([^.\n]+)",
-            r"Secondary outcome[:\s]+([^.\n]+)",
-        ]
-        
+        for field, patterns in _FALLBACK_RES.items():
+            if field == "endpoints":
+                continue
+            
+            for pattern in patterns:
+                match = pattern.search(text_chunk)
+                if match:
+                    value = match.group(1)
+                    if field == "participants":
+                        result[field] = f"{value} participants"
+                    elif field == "study_type":
+                        result[field] = value
+                    elif field == "results_summary":
+                        result[field] = value.strip()[:500]  # Limit length
+                    else:
+                        result[field] = value.strip()
+                    break
+        
+        # Every endpoint pattern contributes all of its matches
         endpoints = []
-        for pattern in endpoint_patterns:
-            matches = re.findall(pattern, text_chunk, re.IGNORECASE)
-            endpoints.extend(matches)
+        for pattern in _FALLBACK_RES["endpoints"]:
+            endpoints.extend(pattern.findall(text_chunk))
         
         if endpoints:
             result["endpoints"] = "; ".join(endpoints[:3])  # Limit to first 3
         
-        # Try to extract results summary (look for key result indicators)
-        result_patterns = [
-            r"Results[:\s]+([^.\n]{50,500})",
-            r"Conclusion[:\s]+([^.\n]{50,500})",
-            r"Findings[:\s]+([^.\n]{50,500})",
-            r"Outcome[:\s]+([^.\n]{50,500})",
-        ]
-        
-        for pattern in result_patterns:
-            match = re.search(pattern, text_chunk, re.IGNORECASE | re.DOTALL)
-            if match:
-                result["results_summary"] = match.group(1).strip()[:500]  # Limit length
-                break
-        
-        # Try to extract methodology
-        method_patterns = [
-            r"Method[:\s]+([^.\n]{50,300})",
-            r"Design[:\s]+([^.\n]{50,300})",
-            r"Study design[:\s]+([^.\n]{50,300})",
-        ]
-        
-        for pattern in method_patterns:
-            match = re.search(pattern, text_chunk, re.IGNORECASE)
-            if match:
-                result["methodology"] = match.group(1).strip()
-                break
-        
-        # Try to extract adverse events
-        ae_patterns = [
-            r"Adverse event[:\s]+([^.\n]{30,300})",
-            r"Safety[:\s]+([^.\n]{30,300})",
-            r"Side effect[:\s]+([^.\n]{30,300})",
-        ]
-        
-        for pattern in ae_patterns:
-            match = re.search(pattern, text_chunk, re.IGNORECASE)
-            if match:
-                result["adverse_events"] = match.group(1).strip()
-                break
-        
-        # Try to extract statistical analysis
-        stats_patterns = [
-            r"Statistical analysis[:\s]+([^.\n]{30,300})",
-            r"p-value[:\s]+([^.\n]{20,200})",
-            r"Significance[:\s]+([^.\n]{20,200})",
-        ]
-        
-        for pattern in stats_patterns:
-            match = re.search(pattern, text_chunk, re.IGNORECASE)
-            if match:
-                result["statistical_analysis"] = match.group(1).strip()
-                break
-        
         return result
     
     def merge_extracted_data(self, data_chunks: list[Dict[str, Any]]) -> Dict[str, Any]:
@@ -259,60 +694,153 @@ class CerebrasClient:
         if len(data_chunks) == 1:
             return data_chunks[0]
         
-        # Merge logic - prioritize non-empty values and combine information
-        merged = {
-            "title": "",
-            "participants": "",
-            "study_type": "",
-            "endpoints": "",
-            "results_summary": "",
-            "methodology": "",
-            "adverse_events": "",
-            "statistical_analysis": ""
-        }
+        # Merge logic - prioritize non-empty values and combine information.
+        # Values are collected in lists and joined once at the end.
+        merged = {key: [] for key in _MERGE_FIELDS}
         
         for chunk_data in data_chunks:
-            for key in merged.keys():
+            for key, values in merged.items():
                 if key in chunk_data and chunk_data[key] and chunk_data[key] != f"Unable to extract {key.replace('_', ' ')}":
                     # Convert to string to ensure we can concatenate
                     chunk_value = str(chunk_data[key])
                     
-                    if not merged[key]:
-                        merged[key] = chunk_value
-                    elif key in ["results_summary", "endpoints", "adverse_events"]:
-                        # Combine these fields
-                        merged[key] += f"\n\n{chunk_value}"
+                    if not values:
+                        values.append(chunk_value)
+                    elif key in _COMBINED_MERGE_FIELDS and chunk_value not in values:
+                        # Combine these fields, skipping text already merged from another chunk
+                        values.append(chunk_value)
         
-        return merged
+        return {key: "\n\n".join(values) for key, values in merged.items()}
     
-    def parse_clinical_trial_pdf(self, pdf_path: str) -> Dict[str, Any]:
+    def parse_clinical_trial_pdf(self, pdf_path: str, concurrency: int = CHUNK_CONCURRENCY,
+                                 batch_size: int = EXTRACTION_BATCH_SIZE) -> Dict[str, Any]:
         """
         Complete pipeline: PDF → text extraction → chunking → Cerebras analysis → structured JSON.
         
         Args:
             pdf_path: Path to the clinical trial PDF file
+            concurrency: Maximum number of Cerebras requests in flight at once
+            batch_size: Number of chunks sent together in one request
             
         Returns:
             Dict containing structured clinical trial data
         """
-        print(f"📄 Extracting text from PDF: {pdf_path}")
-        text = self.extract_text_from_pdf(pdf_path)
-        
-        print(f"📝 Extracted {len(text)} characters of text")
+        print(f"📄 Streaming text chunks from PDF: {pdf_path}")
+        batches = _batched(self.iter_chunks(pdf_path), batch_size)
         
-        print("🔄 Chunking text for processing...")
-        chunks = self.chunk_text(text)
-        print(f"📊 Created {len(chunks)} chunks for analysis")
-        
-        extracted_data = []
-        for i, chunk in enumerate(chunks):
-            print(f"🧠 Processing chunk {i+1}/{len(chunks)} with Cerebras...")
+        def extract(numbered_batch):
+            i, batch = numbered_batch
+            print(f"🧠 Processing chunk batch {i+1} ({len(batch)} chunks) with Cerebras...")
             try:
-                chunk_data = self.extract_clinical_data(chunk)
-                extracted_data.append(chunk_data)
+                return self.extract_clinical_data_batch(batch)
             except Exception as e:
-                print(f"⚠️  Error processing chunk {i+1}: {str(e)}")
-                continue
+                print(f"⚠️  Error processing chunk batch {i+1}: {str(e)}")
+                return []
+        
+        # Each batch is a network round-trip, so run up to `concurrency` of them at once.
+        # The next batch is only read from the PDF once a slot frees up, so at most
+        # `concurrency` batches of chunk text are held at a time.
+        futures = []
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="cerebras") as pool:
+            for numbered_batch in enumerate(batches):
+                pending = [future for future in futures if not future.done()]
+                if len(pending) >= concurrency:
+                    wait(pending, return_when=FIRST_COMPLETED)
+                futures.append(pool.submit(extract, numbered_batch))
+        
+        extracted_data = [data for future in futures for data in future.result()]
+        
+        print("🔄 Merging extracted data...")
+        final_data = self.merge_extracted_data(extracted_data)
+        
+        print("✅ Clinical trial data extraction completed")
+        return final_data
+    
+    async def aparse_clinical_trial_pdf(self, pdf_path: str, pages_per_batch: int = 20,
+                                        concurrency: int = CHUNK_CONCURRENCY,
+                                        batch_size: int = EXTRACTION_BATCH_SIZE) -> Dict[str, Any]:
+        """
+        Async variant of parse_clinical_trial_pdf() that streams the PDF in page batches.
+        
+        Page batches are extracted in a process pool. Chunks are grouped batch_size per
+        request and dispatched to Cerebras as soon as
+        their page batch has been read, with at most `concurrency` requests in flight;
+        results are merged in document order. At most PDF_POOL_WORKERS page batches are
+        submitted ahead, and reading pauses while too many requests are still queued,
+        so memory stays bounded on large documents.
+        
+        Args:
+            pdf_path: Path to the clinical trial PDF file
+            pages_per_batch: Number of pages extracted per batch
+            concurrency: Maximum number of Cerebras requests in flight at once
+            batch_size: Number of chunks sent together in one request
+            
+        Returns:
+            Dict containing structured clinical trial data
+        """
+        print(f"📄 Streaming text from PDF: {pdf_path}")
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def extract(label: str, chunks: List[str]) -> List[Dict[str, Any]]:
+            async with semaphore:
+                print(f"🧠 Processing {label} with Cerebras...")
+                try:
+                    return await self.aextract_clinical_data_batch(chunks)
+                except Exception as e:
+                    print(f"⚠️  Error processing {label}: {str(e)}")
+                    return []
+        
+        # Text extraction is pure-Python CPU work that holds the GIL, so page batches are
+        # extracted in worker processes (in parallel) and consumed here in page order
+        loop = asyncio.get_running_loop()
+        pool = _pdf_pool()
+        page_count = await loop.run_in_executor(pool, _count_pages, pdf_path)
+        page_starts = iter(range(0, page_count, pages_per_batch))
+        page_futures = []
+        tasks = []
+        
+        def submit_next():
+            start = next(page_starts, None)
+            if start is not None:
+                page_futures.append(loop.run_in_executor(
+                    pool, _extract_page_range, pdf_path, start, min(start + pages_per_batch, page_count)
+                ))
+        
+        try:
+            for _ in range(PDF_POOL_WORKERS):
+                submit_next()
+            
+            batch_number = 0
+            while batch_number < len(page_futures):
+                # Queued requests hold their chunk text; wait for some to finish before
+                # reading more of the document
+                while sum(not task.done() for task in tasks) > 2 * concurrency:
+                    await asyncio.wait([task for task in tasks if not task.done()],
+                                       return_when=asyncio.FIRST_COMPLETED)
+                
+                text = await page_futures[batch_number]
+                page_futures[batch_number] = None
+                batch_number += 1
+                submit_next()
+                
+                chunks = self.chunk_text(text)
+                print(f"📄 Page batch {batch_number}: {len(text)} characters in {len(chunks)} chunks")
+                
+                tasks.extend(
+                    asyncio.create_task(extract(
+                        f"batch {batch_number} chunks {start+1}-{start+len(group)}/{len(chunks)}", group
+                    ))
+                    for start, group in zip(range(0, len(chunks), batch_size), _batched(chunks, batch_size))
+                )
+            
+            results = await asyncio.gather(*tasks)
+        except BaseException:
+            for pending in page_futures + tasks:
+                if pending is not None:
+                    pending.cancel()
+            raise
+        
+        extracted_data = [data for group in results for data in group]
         
         print("🔄 Merging extracted data...")
         final_data = self.merge_extracted_data(extracted_data)
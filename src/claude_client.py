@@ -3,22 +3,360 @@ Claude client for analyzing clinical trial data and generating insights and visu
 """
 
 import os
+import re
 import json
-from typing import Dict, Any, Optional, Tuple
-from anthropic import Anthropic
+import time
+import atexit
+import asyncio
+import weakref
+from typing import Dict, Any, Iterator, List, Optional, Tuple, Union
+import httpx
+import orjson
+import anthropic
+from anthropic import Anthropic, AsyncAnthropic
+from src.llm_cache import normalize_for_key
+
+
+# Bump whenever a prompt template changes so cached responses are not reused
+PROMPT_VERSION = 6
+
+# Sampling settings of the analysis call, shared with the batch path so both use the
+# same response cache key
+ANALYSIS_MAX_TOKENS = 4000
+ANALYSIS_TEMPERATURE = 0.3
+
+# Output budgets for the shorter prompts, sized from typical response lengths
+SUMMARY_MAX_TOKENS = 600
+FOLLOWUP_MAX_TOKENS = 900
+
+# The summary and follow-up methods return text starting with these on failure
+SUMMARY_ERROR_PREFIX = "Error generating executive summary: "
+FOLLOWUP_ERROR_PREFIX = "Error generating follow-up study suggestions: "
+
+# How long cached responses are reused, per prompt template (seconds). Set
+# CLAUDE_CACHE_TTL (e.g. 300 while iterating on prompts) to override all of them.
+DEFAULT_CACHE_TTL = 86400
+CACHE_TTLS = {
+    "analysis": 86400,
+    "executive_summary": 86400,
+    "follow_up_studies": 86400
+}
+
+# Static instruction prefixes. Each is sent as its own content block marked with
+# cache_control, ahead of the per-trial data, so Anthropic can reuse the cached
+# prefix across trials. Keep them byte-identical between calls.
+_ANALYSIS_PREFIX = """You are a clinical research expert analyzing clinical trial data. Please provide:
+
+1. **CLINICAL ANALYSIS**: A comprehensive analysis of this clinical trial including:
+   - Study design assessment
+   - Statistical significance of results
+   - Clinical relevance and implications
+   - Safety profile evaluation
+   - Limitations and potential biases
+   - Comparison to standard of care or existing treatments
+   - Recommendations for clinical practice
+
+2. **VISUALIZATION RECOMMENDATIONS**: Suggest specific charts and graphs that would best represent this data. For each visualization, provide:
+   - Chart type (bar, line, scatter, box plot, etc.)
+   - Data to plot (x-axis, y-axis, categories)
+   - Title and labels
+   - Purpose/insight the chart reveals
+
+Please structure your response as follows:
+## Clinical Analysis
+[Your detailed analysis here]
+
+## Visualization Recommendations
+[List of specific chart recommendations with details]
+
+At the end, provide a JSON block with visualization specifications:
+```json
+{
+    "visualizations": [
+        {
+            "type": "bar_chart",
+            "title": "Chart Title",
+            "data_source": "field_name_from_data",
+            "x_label": "X-axis label",
+            "y_label": "Y-axis label",
+            "description": "What this chart shows"
+        }
+    ]
+}
+```
+
+The clinical trial data follows."""
+
+_SUMMARY_PREFIX = """Create a concise executive summary (2-3 paragraphs) of this clinical trial for healthcare professionals.
+Focus on the most important findings, clinical implications, and actionable insights.
+
+Key trial details and a detailed analysis of the full trial data follow."""
+
+_FOLLOWUP_PREFIX = """Based on this clinical trial data, suggest 3-5 potential follow-up studies that would be valuable
+for advancing this research. Consider:
+- Limitations of the current study
+- Unanswered questions
+- Different patient populations
+- Longer-term outcomes
+- Combination therapies
+
+The clinical trial data follows."""
+
+# Per-call text that follows each prefix, filled in with str.format
+_ANALYSIS_TAIL = "Clinical Trial Data:\n{data}"
+_SUMMARY_TAIL = (
+    "Trial: {title} | Type: {study_type} | Participants: {participants}\n"
+    "Key Results:\n{results}\n\n"
+    "Detailed Analysis:\n{analysis}\n\n"
+    "Executive Summary:"
+)
+_FOLLOWUP_TAIL = "Clinical Trial Data:\n{data}\n\nFollow-up Study Recommendations:"
+
+
+# One keep-alive connection pool shared by every sync Anthropic client in the process,
+# so creating a ClaudeClient per request does not pay a new TCP/TLS handshake.
+# Timeouts match the Anthropic SDK defaults (long analyses can take minutes).
+_HTTP = httpx.Client(
+    limits=httpx.Limits(max_keepalive_connections=20, max_connections=50),
+    timeout=httpx.Timeout(600.0, connect=5.0)
+)
+atexit.register(_HTTP.close)
+
+# Maximum number of Claude requests in flight per event loop, across all clients
+MAX_CONCURRENT_REQUESTS = 5
+
+# Retries for rate limits, overload (529), server errors and timeouts. Waits double
+# from RETRY_BASE_DELAY up to RETRY_MAX_DELAY seconds. The SDK's own retries are
+# disabled so this is the only retry policy.
+MAX_ATTEMPTS = 6
+RETRY_BASE_DELAY = 10.0
+RETRY_MAX_DELAY = 120.0
+
+_request_semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = \
+    weakref.WeakKeyDictionary()
+
+
+def _request_semaphore() -> asyncio.Semaphore:
+    """Return the request-limiting semaphore for the running event loop."""
+    loop = asyncio.get_running_loop()
+    semaphore = _request_semaphores.get(loop)
+    if semaphore is None:
+        semaphore = _request_semaphores[loop] = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+    return semaphore
+
+
+# Fenced ```json block holding the visualization specifications
+_VIZ_RE = re.compile(r"```json\s*(\{.*?\})\s*```", re.DOTALL)
+
+
+def _retryable(error: Exception) -> bool:
+    """Whether an Anthropic API error is transient and worth retrying."""
+    if isinstance(error, (anthropic.RateLimitError, anthropic.APITimeoutError, anthropic.APIConnectionError)):
+        return True
+    return isinstance(error, anthropic.APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(attempt: int) -> float:
+    """Backoff before retry number attempt (0-based)."""
+    return min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** attempt)
+
+
+def _compact(obj: Any) -> str:
+    """Serialize data for a prompt without indentation; whitespace only costs input tokens."""
+    return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+
+
+def _field_text(data: Dict[str, Any], field: str) -> str:
+    """Render one extracted field for a prompt: strings as-is, anything else as compact JSON."""
+    value = data.get(field)
+    if value in (None, "", [], {}):
+        return "?"
+    return value if isinstance(value, str) else _compact(value)
+
+
+def _prefix_block(prefix: str) -> Dict[str, Any]:
+    """Build the cacheable content block for a static prompt prefix."""
+    return {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}
+
+
+# Built once and shared by every request (the SDK does not mutate them)
+_ANALYSIS_BLOCK = _prefix_block(_ANALYSIS_PREFIX)
+_SUMMARY_BLOCK = _prefix_block(_SUMMARY_PREFIX)
+_FOLLOWUP_BLOCK = _prefix_block(_FOLLOWUP_PREFIX)
+
+
+def _prompt_blocks(prefix_block: Dict[str, Any], dynamic: str) -> List[Dict[str, Any]]:
+    """Build message content with a cacheable static prefix followed by the per-call text."""
+    return [prefix_block, {"type": "text", "text": dynamic}]
 
 
 class ClaudeClient:
     """Client for interacting with Claude API for clinical trial analysis."""
     
-    def __init__(self, api_key: Optional[str] = None):
-        """Initialize the Claude client with API key."""
+    def __init__(self, api_key: Optional[str] = None, cache=None,
+                 http_client: Optional[httpx.AsyncClient] = None):
+        """
+        Initialize the Claude client with API key.
+        
+        Args:
+            api_key: Anthropic API key (defaults to CLAUDE_API_KEY)
+            cache: Optional LLMCache used to reuse responses for identical inputs
+            http_client: Optional shared httpx.AsyncClient used by the async methods
+        """
         self.api_key = api_key or os.getenv("CLAUDE_API_KEY")
         if not self.api_key:
             raise ValueError("CLAUDE_API_KEY not found in environment variables")
         
-        self.client = Anthropic(api_key=self.api_key)
+        self.client = Anthropic(api_key=self.api_key, http_client=_HTTP, max_retries=0)
+        self.set_http_client(http_client)
         self.model = "claude-3-5-sonnet-20241022"  # Latest Claude model
+        self.cache = cache
+        
+        # Prompt cache usage reported by the API, summed over all calls
+        self.cache_read_input_tokens = 0
+        self.cache_creation_input_tokens = 0
+    
+    def set_http_client(self, http_client: Optional[httpx.AsyncClient]):
+        """Rebuild the async Anthropic client on top of a shared httpx.AsyncClient."""
+        if http_client is None:
+            self.async_client = AsyncAnthropic(api_key=self.api_key, max_retries=0)
+        else:
+            self.async_client = AsyncAnthropic(api_key=self.api_key, http_client=http_client, max_retries=0)
+    
+    def _record_usage(self, response):
+        """Accumulate the prompt cache token counts reported for a response."""
+        usage = getattr(response, "usage", None)
+        self.cache_read_input_tokens += getattr(usage, "cache_read_input_tokens", None) or 0
+        self.cache_creation_input_tokens += getattr(usage, "cache_creation_input_tokens", None) or 0
+    
+    def _cache_key(self, cache_as: Optional[Tuple[str, Any]], prompt: Union[str, List[Dict[str, Any]]],
+                   max_tokens: int, temperature: float) -> Optional[str]:
+        """
+        Build the response cache key for a call.
+        
+        The key is a SHA-256 over the model, sampling settings, the static part of the
+        prompt and the normalized template inputs (see normalize_for_key), so
+        re-extractions of the same trial that differ only in whitespace or empty fields
+        reuse one response.
+        """
+        if self.cache is None or cache_as is None:
+            return None
+        
+        template_id, inputs = cache_as
+        if isinstance(prompt, str):
+            template = prompt
+        else:
+            template = [block["text"] for block in prompt if "cache_control" in block]
+        return self.cache.key(
+            self.model,
+            f"{template_id}:v{PROMPT_VERSION}",
+            {"template": template, "inputs": normalize_for_key(inputs),
+             "max_tokens": max_tokens, "temperature": temperature}
+        )
+    
+    def _cache_ttl(self, cache_as: Tuple[str, Any]) -> float:
+        """Return how long responses for a template stay cached (CLAUDE_CACHE_TTL overrides)."""
+        override = os.getenv("CLAUDE_CACHE_TTL")
+        if override:
+            return float(override)
+        return CACHE_TTLS.get(cache_as[0], DEFAULT_CACHE_TTL)
+    
+    def _retry(self, fn, *args, **kwargs):
+        """Call a sync Anthropic API method, retrying with exponential backoff on transient errors."""
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                return fn(*args, **kwargs)
+            except anthropic.APIError as e:
+                if attempt == MAX_ATTEMPTS - 1 or not _retryable(e):
+                    raise
+                delay = _retry_delay(attempt)
+                print(f"⏳ Claude API busy ({type(e).__name__}), retrying in {delay:.0f}s")
+                time.sleep(delay)
+    
+    def _create(self, **kwargs):
+        """messages.create() with retries (see _retry)."""
+        return self._retry(self.client.messages.create, **kwargs)
+    
+    async def _acreate(self, **kwargs):
+        """Async variant of _create(); the concurrency slot is released while backing off."""
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                async with _request_semaphore():
+                    return await self.async_client.messages.create(**kwargs)
+            except anthropic.APIError as e:
+                if attempt == MAX_ATTEMPTS - 1 or not _retryable(e):
+                    raise
+                delay = _retry_delay(attempt)
+                print(f"⏳ Claude API busy ({type(e).__name__}), retrying in {delay:.0f}s")
+                await asyncio.sleep(delay)
+    
+    def chat(self, prompt: Union[str, List[Dict[str, Any]]], max_tokens: int, temperature: float,
+             cache_as: Optional[Tuple[str, Any]] = None) -> str:
+        """
+        Send a single-turn prompt to Claude and return the response text.
+        
+        prompt is either plain text or a list of content blocks (see _prompt_blocks).
+        When cache_as is given as (template_id, inputs) and a cache is configured,
+        a previous response for the same template, prompt and settings is returned instead.
+        """
+        key = self._cache_key(cache_as, prompt, max_tokens, temperature)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = self._create(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        )
+        
+        self._record_usage(response)
+        text = response.content[0].text
+        if key:
+            self.cache.set(key, text, ttl=self._cache_ttl(cache_as))
+        return text
+    
+    async def achat(self, prompt: Union[str, List[Dict[str, Any]]], max_tokens: int, temperature: float,
+                    cache_as: Optional[Tuple[str, Any]] = None) -> str:
+        """
+        Async variant of chat() backed by the AsyncAnthropic client.
+        
+        At most MAX_CONCURRENT_REQUESTS calls per event loop wait on the API at once.
+        """
+        key = self._cache_key(cache_as, prompt, max_tokens, temperature)
+        if key:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        response = await self._acreate(
+            model=self.model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+            messages=[
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ]
+        )
+        
+        self._record_usage(response)
+        text = response.content[0].text
+        if key:
+            self.cache.set(key, text, ttl=self._cache_ttl(cache_as))
+        return text
+    
+    def _build_analysis_prompt(self, clinical_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the clinical analysis + visualization recommendations prompt."""
+        return _prompt_blocks(_ANALYSIS_BLOCK, _ANALYSIS_TAIL.format(data=_compact(clinical_data)))
     
     def analyze_clinical_data(self, clinical_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
         """
@@ -30,67 +368,107 @@ class ClaudeClient:
         Returns:
             Tuple of (analysis_text, visualization_recommendations)
         """
-        prompt = f"""
-        You are a clinical research expert analyzing clinical trial data. Please provide:
-
-        1. **CLINICAL ANALYSIS**: A comprehensive analysis of this clinical trial including:
-           - Study design assessment
-           - Statistical significance of results
-           - Clinical relevance and implications
-           - Safety profile evaluation
-           - Limitations and potential biases
-           - Comparison to standard of care or existing treatments
-           - Recommendations for clinical practice
-
-        2. **VISUALIZATION RECOMMENDATIONS**: Suggest specific charts and graphs that would best represent this data. For each visualization, provide:
-           - Chart type (bar, line, scatter, box plot, etc.)
-           - Data to plot (x-axis, y-axis, categories)
-           - Title and labels
-           - Purpose/insight the chart reveals
-
-        Clinical Trial Data:
-        {json.dumps(clinical_data, indent=2)}
-
-        Please structure your response as follows:
-        ## Clinical Analysis
-        [Your detailed analysis here]
-
-        ## Visualization Recommendations
-        [List of specific chart recommendations with details]
-
-        At the end, provide a JSON block with visualization specifications:
-        ```json
-        {{
-            "visualizations": [
-                {{
-                    "type": "bar_chart",
-                    "title": "Chart Title",
-                    "data_source": "field_name_from_data",
-                    "x_label": "X-axis label",
-                    "y_label": "Y-axis label",
-                    "description": "What this chart shows"
-                }}
-            ]
-        }}
-        ```
+        content = ""
+        viz_recommendations = {}
+        for kind, value in self.analyze_clinical_data_stream(clinical_data):
+            if kind == "visualizations":
+                viz_recommendations = value
+            elif kind == "done":
+                content = value
+        
+        return content, viz_recommendations
+    
+    def analyze_clinical_data_stream(self, clinical_data: Dict[str, Any]) -> Iterator[Tuple[str, Any]]:
         """
+        Stream the clinical analysis as it is generated.
         
-        try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=4000,
-                temperature=0.3,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
-            
-            content = response.content[0].text
+        Yields ("text", delta) for each piece of text, ("visualizations", dict) as soon as
+        the closing fence of the JSON visualization block arrives, and finally
+        ("done", full_text). A cached analysis is yielded as a single text piece.
+        """
+        prompt = self._build_analysis_prompt(clinical_data)
+        cache_as = ("analysis", clinical_data)
+        key = self._cache_key(cache_as, prompt, ANALYSIS_MAX_TOKENS, ANALYSIS_TEMPERATURE)
+        cached = self.cache.get(key) if key else None
+        if cached is not None:
+            yield "text", cached
+            yield "visualizations", self._extract_visualization_json(cached)
+            yield "done", cached
+            return
+        
+        text = ""
+        # Where the ```json block's body starts (None until the marker is seen), and
+        # where to resume searching so each delta only scans the new text
+        json_start = None
+        scan_from = 0
+        viz_found = False
+        
+        for attempt in range(MAX_ATTEMPTS):
+            try:
+                with self.client.messages.stream(
+                    model=self.model,
+                    max_tokens=ANALYSIS_MAX_TOKENS,
+                    temperature=ANALYSIS_TEMPERATURE,
+                    messages=[
+                        {
+                            "role": "user",
+                            "content": prompt
+                        }
+                    ]
+                ) as stream:
+                    for delta in stream.text_stream:
+                        text += delta
+                        yield "text", delta
+                        
+                        if viz_found:
+                            continue
+                        
+                        if json_start is None:
+                            idx = text.find("```json", max(0, scan_from - len("```json")))
+                            if idx == -1:
+                                scan_from = len(text)
+                                continue
+                            json_start = scan_from = idx + len("```json")
+                        
+                        end = text.find("```", max(json_start, scan_from - len("```")))
+                        if end == -1:
+                            scan_from = len(text)
+                            continue
+                        
+                        viz_found = True
+                        try:
+                            viz = json.loads(text[json_start:end].strip())
+                        except json.JSONDecodeError:
+                            viz = self._create_default_visualizations()
+                        yield "visualizations", viz
+                    
+                    self._record_usage(stream.get_final_message())
+                break
             
-            # Extract visualization recommendations JSON
+            except anthropic.APIError as e:
+                # Text already yielded cannot be taken back, so only failures before the
+                # first token are retried
+                if text or attempt == MAX_ATTEMPTS - 1 or not _retryable(e):
+                    raise Exception(f"Claude API error: {str(e)}")
+                delay = _retry_delay(attempt)
+                print(f"⏳ Claude API busy ({type(e).__name__}), retrying in {delay:.0f}s")
+                time.sleep(delay)
+            except Exception as e:
+                raise Exception(f"Claude API error: {str(e)}")
+        
+        if key:
+            self.cache.set(key, text, ttl=self._cache_ttl(cache_as))
+        if not viz_found:
+            yield "visualizations", self._extract_visualization_json(text)
+        yield "done", text
+    
+    async def aanalyze_clinical_data(self, clinical_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
+        """Async variant of analyze_clinical_data()."""
+        prompt = self._build_analysis_prompt(clinical_data)
+        
+        try:
+            content = await self.achat(prompt, max_tokens=ANALYSIS_MAX_TOKENS,
+                                       temperature=ANALYSIS_TEMPERATURE, cache_as=("analysis", clinical_data))
             viz_recommendations = self._extract_visualization_json(content)
             
             return content, viz_recommendations
@@ -98,27 +476,90 @@ class ClaudeClient:
         except Exception as e:
             raise Exception(f"Claude API error: {str(e)}")
     
+    def batch_analyze(self, clinical_datasets: List[Dict[str, Any]],
+                      poll_interval: float = 30) -> List[Optional[Tuple[str, Dict[str, Any]]]]:
+        """
+        Analyze several trials through the Message Batches API (half the per-token price).
+        
+        Trials with a cached analysis are not resubmitted. Each successful result is
+        stored in the response cache under the same key analyze_clinical_data() uses, so
+        later per-trial calls return it without another request.
+        
+        Args:
+            clinical_datasets: Structured clinical trial data, one dict per trial
+            poll_interval: Seconds to wait between batch status checks
+            
+        Returns:
+            One (analysis_text, visualization_recommendations) tuple per input, in order,
+            or None for trials whose batch request failed
+        """
+        results: List[Optional[Tuple[str, Dict[str, Any]]]] = [None] * len(clinical_datasets)
+        pending = {}
+        
+        for i, clinical_data in enumerate(clinical_datasets):
+            prompt = self._build_analysis_prompt(clinical_data)
+            cache_as = ("analysis", clinical_data)
+            key = self._cache_key(cache_as, prompt, ANALYSIS_MAX_TOKENS, ANALYSIS_TEMPERATURE)
+            cached = self.cache.get(key) if key else None
+            if cached is not None:
+                results[i] = (cached, self._extract_visualization_json(cached))
+            else:
+                pending[f"trial-{i}"] = (i, prompt, key, cache_as)
+        
+        if not pending:
+            return results
+        
+        batch = self._retry(
+            self.client.messages.batches.create,
+            requests=[
+                {
+                    "custom_id": custom_id,
+                    "params": {
+                        "model": self.model,
+                        "max_tokens": ANALYSIS_MAX_TOKENS,
+                        "temperature": ANALYSIS_TEMPERATURE,
+                        "messages": [
+                            {
+                                "role": "user",
+                                "content": prompt
+                            }
+                        ]
+                    }
+                }
+                for custom_id, (_, prompt, _, _) in pending.items()
+            ]
+        )
+        print(f"📦 Submitted Claude batch {batch.id} with {len(pending)} analyses")
+        
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = self._retry(self.client.messages.batches.retrieve, batch.id)
+        
+        for entry in self._retry(self.client.messages.batches.results, batch.id):
+            i, _, key, cache_as = pending[entry.custom_id]
+            if entry.result.type != "succeeded":
+                print(f"⚠️  Claude batch request {entry.custom_id} {entry.result.type}")
+                continue
+            
+            message = entry.result.message
+            self._record_usage(message)
+            text = message.content[0].text
+            if key:
+                self.cache.set(key, text, ttl=self._cache_ttl(cache_as))
+            results[i] = (text, self._extract_visualization_json(text))
+        
+        return results
+    
     def _extract_visualization_json(self, content: str) -> Dict[str, Any]:
         """Extract JSON visualization recommendations from Claude's response."""
+        # Look for JSON block in the response
+        match = _VIZ_RE.search(content)
+        if match is None:
+            return {"visualizations": []}
+        
         try:
-            # Look for JSON block in the response
-            start_marker = "```json"
-            end_marker = "```"
-            
-            start_idx = content.find(start_marker)
-            if start_idx == -1:
-                return {"visualizations": []}
-            
-            start_idx += len(start_marker)
-            end_idx = content.find(end_marker, start_idx)
-            
-            if end_idx == -1:
-                return {"visualizations": []}
-            
-            json_str = content[start_idx:end_idx].strip()
-            return json.loads(json_str)
-            
-        except (json.JSONDecodeError, Exception):
+            return json.loads(match.group(1))
+        except json.JSONDecodeError:
             # Fallback: create default visualizations based on common clinical trial data
             return self._create_default_visualizations()
     
@@ -153,88 +594,108 @@ class ClaudeClient:
             ]
         }
     
+    def _build_summary_prompt(self, clinical_data: Dict[str, Any], analysis: str) -> List[Dict[str, Any]]:
+        """
+        Build the executive summary prompt.
+        
+        The analysis was generated from the full clinical data, so only a short header
+        and the key results are sent alongside it rather than the data again.
+        """
+        return _prompt_blocks(
+            _SUMMARY_BLOCK,
+            _SUMMARY_TAIL.format(
+                title=_field_text(clinical_data, "title"),
+                study_type=_field_text(clinical_data, "study_type"),
+                participants=_field_text(clinical_data, "participants"),
+                results=_field_text(clinical_data, "results_summary"),
+                analysis=analysis
+            )
+        )
+    
     def generate_executive_summary(self, clinical_data: Dict[str, Any], analysis: str) -> str:
         """Generate a concise executive summary of the clinical trial."""
-        prompt = f"""
-        Create a concise executive summary (2-3 paragraphs) of this clinical trial for healthcare professionals. 
-        Focus on the most important findings, clinical implications, and actionable insights.
-
-        Clinical Data:
-        {json.dumps(clinical_data, indent=2)}
-
-        Detailed Analysis:
-        {analysis}
-
-        Executive Summary:
-        """
+        prompt = self._build_summary_prompt(clinical_data, analysis)
         
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1000,
-                temperature=0.2,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
+            return self.chat(prompt, max_tokens=SUMMARY_MAX_TOKENS, temperature=0.2,
+                             cache_as=("executive_summary", [clinical_data, analysis]))
             
-            return response.content[0].text
+        except Exception as e:
+            return f"{SUMMARY_ERROR_PREFIX}{str(e)}"
+    
+    async def agenerate_executive_summary(self, clinical_data: Dict[str, Any], analysis: str) -> str:
+        """Async variant of generate_executive_summary()."""
+        prompt = self._build_summary_prompt(clinical_data, analysis)
+        
+        try:
+            return await self.achat(prompt, max_tokens=SUMMARY_MAX_TOKENS, temperature=0.2,
+                                    cache_as=("executive_summary", [clinical_data, analysis]))
             
         except Exception as e:
-            return f"Error generating executive summary: {str(e)}"
+            return f"{SUMMARY_ERROR_PREFIX}{str(e)}"
+    
+    def _build_followup_prompt(self, clinical_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Build the follow-up study suggestions prompt."""
+        return _prompt_blocks(_FOLLOWUP_BLOCK, _FOLLOWUP_TAIL.format(data=_compact(clinical_data)))
     
     def suggest_follow_up_studies(self, clinical_data: Dict[str, Any]) -> str:
         """Suggest potential follow-up studies based on the current trial results."""
-        prompt = f"""
-        Based on this clinical trial data, suggest 3-5 potential follow-up studies that would be valuable 
-        for advancing this research. Consider:
-        - Limitations of the current study
-        - Unanswered questions
-        - Different patient populations
-        - Longer-term outcomes
-        - Combination therapies
-
-        Clinical Trial Data:
-        {json.dumps(clinical_data, indent=2)}
-
-        Follow-up Study Recommendations:
-        """
+        prompt = self._build_followup_prompt(clinical_data)
         
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=1500,
-                temperature=0.4,
-                messages=[
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ]
-            )
+            return self.chat(prompt, max_tokens=FOLLOWUP_MAX_TOKENS, temperature=0.4,
+                             cache_as=("follow_up_studies", clinical_data))
             
-            return response.content[0].text
+        except Exception as e:
+            return f"{FOLLOWUP_ERROR_PREFIX}{str(e)}"
+    
+    async def asuggest_follow_up_studies(self, clinical_data: Dict[str, Any]) -> str:
+        """Async variant of suggest_follow_up_studies()."""
+        prompt = self._build_followup_prompt(clinical_data)
+        
+        try:
+            return await self.achat(prompt, max_tokens=FOLLOWUP_MAX_TOKENS, temperature=0.4,
+                                    cache_as=("follow_up_studies", clinical_data))
             
         except Exception as e:
-            return f"Error generating follow-up study suggestions: {str(e)}"
+            return f"{FOLLOWUP_ERROR_PREFIX}{str(e)}"
+
+    
+    async def run_all(self, clinical_data: Dict[str, Any]) -> Tuple[str, Dict[str, Any], str, str]:
+        """
+        Run the analysis, executive summary and follow-up suggestions with maximum overlap.
+        
+        The follow-up suggestions only need the clinical data, so they run alongside the
+        analysis; the executive summary starts as soon as the analysis is available.
+        
+        Returns:
+            Tuple of (analysis_text, visualization_recommendations, executive_summary,
+            follow_up_studies)
+        """
+        follow_up_task = asyncio.create_task(self.asuggest_follow_up_studies(clinical_data))
+        try:
+            analysis_text, viz_recommendations = await self.aanalyze_clinical_data(clinical_data)
+            exec_summary = await self.agenerate_executive_summary(clinical_data, analysis_text)
+            follow_up = await follow_up_task
+        except BaseException:
+            follow_up_task.cancel()
+            raise
+        
+        return analysis_text, viz_recommendations, exec_summary, follow_up
 
 
 # Example usage and testing function
-def test_claude_client():
-    """Test function for the Claude client."""
+def test_claude_client(verbose: bool = False):
+    """Test function for the Claude client; verbose also prints API key diagnostics."""
     try:
-        # Debug: Check what's in the environment
-        import os
         from dotenv import load_dotenv
         load_dotenv()
         
-        raw_key = os.getenv("CLAUDE_API_KEY")
-        print(f"🔍 Raw API key from env: {raw_key[:20] if raw_key else 'None'}...")
-        print(f"🔍 API key length: {len(raw_key) if raw_key else 0}")
-        print(f"🔍 API key starts with sk-ant: {raw_key.startswith('sk-ant') if raw_key else False}")
+        if verbose:
+            raw_key = os.getenv("CLAUDE_API_KEY")
+            print(f"🔍 Raw API key from env: {raw_key[:20] if raw_key else 'None'}...")
+            print(f"🔍 API key length: {len(raw_key) if raw_key else 0}")
+            print(f"🔍 API key starts with sk-ant: {raw_key.startswith('sk-ant') if raw_key else False}")
         
         client = ClaudeClient()
         print("✅ Claude client initialized successfully")
@@ -255,4 +716,13 @@ def test_claude_client():
 
 
 if __name__ == "__main__":
-    test_claude_client()
+    import sys
+    import argparse
+    
+    # Emoji output on consoles whose default encoding is a legacy code page (Windows)
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+    
+    parser = argparse.ArgumentParser(description="Check the Claude client configuration")
+    parser.add_argument("--verbose", action="store_true", help="Print API key diagnostics")
+    test_claude_client(verbose=parser.parse_args().verbose)
@@ -0,0 +1,323 @@
+"""
+Response cache for LLM calls so re-analyzing the same clinical data skips the API round-trip.
+"""
+
+import os
+import json
+import mmap
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+from typing import Any, BinaryIO, Dict, Optional, Protocol, Tuple
+
+
+def file_digest(filepath: str) -> str:
+    """Hash a file's contents with BLAKE2b via a read-only memory map (no heap copy)."""
+    with open(filepath, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            # mmap cannot map empty files
+            return hashlib.blake2b(b"", digest_size=16).hexdigest()
+
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return hashlib.blake2b(mapped, digest_size=16).hexdigest()
+
+
+def copy_with_digest(src: BinaryIO, dst: BinaryIO, bufsize: int = 1024 * 1024) -> str:
+    """Copy a binary stream in blocks, returning the same BLAKE2b digest file_digest() would."""
+    hasher = hashlib.blake2b(digest_size=16)
+    while True:
+        block = src.read(bufsize)
+        if not block:
+            break
+        hasher.update(block)
+        dst.write(block)
+    return hasher.hexdigest()
+
+
+def canonical_json(obj: Any) -> str:
+    """Serialize an object deterministically so equal data always hashes the same."""
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def normalize_for_key(obj: Any) -> Any:
+    """
+    Reduce data to a canonical form so re-extractions of the same trial key alike.
+    
+    Whitespace inside strings is collapsed and empty dict values are dropped, since
+    extraction runs differ in spacing and in which optional fields come back empty.
+    Case, list order and duplicates are kept: they can carry meaning (drug and gene
+    names, endpoint priority, repeated adverse events).
+    """
+    if isinstance(obj, str):
+        return " ".join(obj.split())
+    if isinstance(obj, dict):
+        normalized = {str(key): normalize_for_key(value) for key, value in obj.items()}
+        return {key: value for key, value in normalized.items() if value not in (None, "", [], {})}
+    if isinstance(obj, (list, tuple)):
+        return [normalize_for_key(item) for item in obj]
+    return obj
+
+
+def cache_key(model: str, template_id: str, payload: Any) -> str:
+    """Build a SHA-256 cache key from the model, prompt template and prompt inputs."""
+    key_data = {
+        "model": model,
+        "template": template_id,
+        "payload": payload
+    }
+    return hashlib.sha256(canonical_json(key_data).encode("utf-8")).hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Storage interface used by LLMCache."""
+
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        ...
+
+
+class MemoryBackend:
+    """In-process cache backend; entries are lost when the process exits."""
+
+    def __init__(self):
+        self._entries: Dict[str, Tuple[Optional[float], str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at is not None and expires_at < time.time():
+                del self._entries[key]
+                return None
+
+            return value
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+
+
+class SQLiteBackend:
+    """
+    SQLite cache backend so cached responses survive across CLI runs.
+    
+    Values are stored zlib-compressed; rows written as plain text by older versions
+    are still readable.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_cache ("
+            "key TEXT PRIMARY KEY, expires_at REAL, value TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            expires_at, value = row
+            if expires_at is not None and expires_at < time.time():
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+
+        if isinstance(value, bytes):
+            try:
+                return zlib.decompress(value).decode("utf-8")
+            except (zlib.error, UnicodeDecodeError):
+                return None
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float]) -> None:
+        expires_at = time.time() + ttl if ttl else None
+        compressed = zlib.compress(value.encode("utf-8"), 6)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, expires_at, value) VALUES (?, ?, ?)",
+                (key, expires_at, compressed)
+            )
+            self._conn.commit()
+
+    def close(self):
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
+
+
+class LLMCache:
+    """Cache of LLM response texts keyed by model, prompt template and inputs."""
+
+    def __init__(self, backend: Optional[CacheBackend] = None, default_ttl: float = 86400):
+        """Initialize the cache with a storage backend (in-memory by default)."""
+        self.backend = backend or MemoryBackend()
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, model: str, template_id: str, payload: Any) -> str:
+        """Build the cache key for a prompt template applied to the given inputs."""
+        return cache_key(model, template_id, payload)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached response text for a key, or None on a miss."""
+        try:
+            value = self.backend.get(key)
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache read failed: {str(e)}")
+            value = None
+
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        """Store a response text under a key."""
+        try:
+            self.backend.set(key, value, ttl if ttl is not None else self.default_ttl)
+        except sqlite3.Error as e:
+            print(f"⚠️  LLM cache write failed: {str(e)}")
+
+
+class ExtractionCache:
+    """
+    Disk cache of structured PDF extraction results keyed by the PDF's content hash.
+    
+    Entries older than ttl seconds are treated as misses. When the cache directory grows
+    past max_bytes, the least recently read entries (by access time) are deleted.
+    """
+
+    def __init__(self, cache_dir: str, ttl: Optional[float] = 30 * 86400,
+                 max_bytes: Optional[int] = 512 * 1024 * 1024):
+        """Initialize the cache, creating cache_dir if needed."""
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+        # digest -> (written_at, data)
+        self._memory: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self._digests: Dict[Tuple[str, int, int], str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _file_id(pdf_path: str) -> Tuple[str, int, int]:
+        stat = os.stat(pdf_path)
+        return (os.path.abspath(pdf_path), stat.st_size, stat.st_mtime_ns)
+
+    def digest_for(self, pdf_path: str) -> str:
+        """Return the content hash of a PDF, re-hashing only if the file changed."""
+        file_id = self._file_id(pdf_path)
+        with self._lock:
+            digest = self._digests.get(file_id)
+        if digest is None:
+            digest = file_digest(pdf_path)
+            with self._lock:
+                self._digests[file_id] = digest
+        return digest
+
+    def register_digest(self, pdf_path: str, digest: str):
+        """Record a digest computed while the file was written, so digest_for() skips re-reading it."""
+        file_id = self._file_id(pdf_path)
+        with self._lock:
+            self._digests[file_id] = digest
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _expired(self, written_at: float) -> bool:
+        return self.ttl is not None and time.time() - written_at > self.ttl
+
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """Return the cached extraction for a content hash, or None on a miss."""
+        path = self._path(digest)
+        with self._lock:
+            entry = self._memory.get(digest)
+        
+        if entry is None:
+            try:
+                written_at = os.stat(path).st_mtime
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                return None
+            entry = (written_at, data)
+            with self._lock:
+                self._memory[digest] = entry
+
+        written_at, data = entry
+        if self._expired(written_at):
+            with self._lock:
+                self._memory.pop(digest, None)
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+
+        # Record the read explicitly; many filesystems mount with noatime/relatime
+        try:
+            os.utime(path, (time.time(), written_at))
+        except OSError:
+            pass
+        return data
+
+    def set(self, digest: str, data: Dict[str, Any]):
+        """Store an extraction result, writing it atomically so readers never see partial files."""
+        final_path = self._path(digest)
+        tmp_path = f"{final_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, final_path)
+
+        with self._lock:
+            self._memory[digest] = (time.time(), data)
+
+        if self.max_bytes is not None:
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently read entries until the cache fits in max_bytes."""
+        entries = []
+        total = 0
+        with os.scandir(self.cache_dir) as it:
+            for entry in it:
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_atime, stat.st_size, entry.path, entry.name[:-len(".json")]))
+                total += stat.st_size
+
+        if total <= self.max_bytes:
+            return
+
+        for _, size, path, digest in sorted(entries):
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            with self._lock:
+                self._memory.pop(digest, None)
+            total -= size
+            if total <= self.max_bytes:
+                break
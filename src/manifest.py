@@ -0,0 +1,74 @@
+"""
+Run manifest recording each pipeline stage's input hash and output files, so re-running
+the same PDF can skip stages whose inputs have not changed.
+"""
+
+import os
+import json
+import hashlib
+import threading
+from collections import namedtuple
+from typing import Any, Dict, List, Optional
+
+from src.llm_cache import canonical_json
+
+
+Stage = namedtuple("Stage", "name input_hash output_paths payload")
+
+
+def stage_hash(inputs: Any) -> str:
+    """Hash the canonical JSON form of a stage's inputs."""
+    return hashlib.blake2b(canonical_json(inputs).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class RunManifest:
+    """Per-PDF record of completed pipeline stages, stored as <manifest_dir>/<pdf_digest>.json."""
+
+    def __init__(self, manifest_dir: str, pdf_digest: str):
+        """Load the manifest for a PDF, starting empty if none exists or it is unreadable."""
+        os.makedirs(manifest_dir, exist_ok=True)
+        self.path = os.path.join(manifest_dir, f"{pdf_digest}.json")
+        self.stages: Dict[str, Stage] = {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            for name, entry in data.get("stages", {}).items():
+                self.stages[name] = Stage(
+                    name, entry["input_hash"], entry["output_paths"], entry.get("payload")
+                )
+        except (OSError, json.JSONDecodeError, KeyError, TypeError, AttributeError):
+            self.stages = {}
+
+    def reusable(self, name: str, input_hash: str) -> Optional[Stage]:
+        """Return the recorded stage if its inputs are unchanged and all its outputs still exist."""
+        stage = self.stages.get(name)
+        if stage is None or stage.input_hash != input_hash:
+            return None
+
+        if not all(os.path.exists(path) for path in stage.output_paths):
+            return None
+
+        return stage
+
+    def record(self, name: str, input_hash: str, output_paths: List[str], payload: Any = None):
+        """Record a completed stage."""
+        self.stages[name] = Stage(name, input_hash, list(output_paths), payload)
+
+    def save(self):
+        """Write the manifest atomically."""
+        data = {
+            "stages": {
+                name: {
+                    "input_hash": stage.input_hash,
+                    "output_paths": stage.output_paths,
+                    "payload": stage.payload
+                }
+                for name, stage in self.stages.items()
+            }
+        }
+
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, default=str)
+        os.replace(tmp_path, self.path)
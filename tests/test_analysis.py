@@ -0,0 +1,151 @@
+"""
+Tests for the clinical trial analyzer's figure reuse and dictionary-string cleaning.
+"""
+
+import ast
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+pytest.importorskip("matplotlib")
+
+from src.analysis import ClinicalTrialAnalyzer
+
+
+SAMPLE_DATA = {
+    "title": "Test Clinical Trial",
+    "participants": "200 patients",
+    "study_type": "Phase II randomized controlled trial",
+    "endpoints": "Primary: Overall response rate",
+    "results_summary": "Treatment group showed 65% response rate vs 35% in control",
+    "methodology": "Randomized, double-blind",
+    "adverse_events": "Mild fatigue (45%), nausea (30%)",
+    "statistical_analysis": "p-value = 0.001",
+}
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    analyzer = ClinicalTrialAnalyzer(output_dir=str(tmp_path))
+    yield analyzer
+    analyzer.close()
+
+
+def test_figures_are_shared_across_threads_and_bounded(analyzer):
+    # Render from more threads than the chart pool has, as asyncio.to_thread callers do
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        paths = list(pool.map(
+            lambda i: analyzer.create_efficacy_chart(SAMPLE_DATA, run_id=f"run{i}"), range(16)
+        ))
+
+    assert len(set(paths)) == 16
+    assert not analyzer._figures_out
+    assert all(len(free) <= analyzer.FIGURES_PER_LAYOUT for free in analyzer._free_figures.values())
+
+    # A figure is reused by the next chart of the same layout
+    fig = analyzer._free_figures[(1, 1, (12, 8))][-1]
+    assert analyzer._get_fig(1, 1, (12, 8))[0] is fig
+
+
+def test_close_drops_every_cached_figure(analyzer):
+    analyzer.generate_standard_visualizations(SAMPLE_DATA, run_id="run")
+    analyzer.create_summary_dashboard(SAMPLE_DATA, run_id="run")
+    assert analyzer._free_figures
+
+    analyzer.close()
+    assert not analyzer._free_figures
+
+
+def reference_clean(text, max_length=200):
+    """_clean_dictionary_string as originally written, without the JSON or caching layers."""
+    if not isinstance(text, str):
+        return str(text)
+
+    def readable(data):
+        result = '; '.join(f"{key.replace('_', ' ').title()}: {value}" for key, value in data.items())
+        return result[:max_length] + "..." if len(result) > max_length else result
+
+    def first_pair(dict_str):
+        inner = dict_str.strip()[1:-1]
+        colon_pos = inner.find(':')
+        if colon_pos > 0:
+            key = inner[:colon_pos].strip().strip("'\"")
+            value = inner[colon_pos+1:].strip().strip("'\"")
+            if ',' in value:
+                value = value[:value.find(',')].strip()
+            result = f"{key.replace('_', ' ').title()}: {value}"
+            return result[:max_length] + "..." if len(result) > max_length else result
+        return None
+
+    if text.strip().startswith('{') and text.strip().endswith('}'):
+        try:
+            data = ast.literal_eval(text)
+            if isinstance(data, dict):
+                return readable(data)
+        except (ValueError, SyntaxError):
+            result = first_pair(text)
+            if result is not None:
+                return result
+
+    if '{' in text and '}' in text:
+        start = text.find('{')
+        brace_count = 0
+        end = start
+        for i, char in enumerate(text[start:], start):
+            if char == '{':
+                brace_count += 1
+            elif char == '}':
+                brace_count -= 1
+                if brace_count == 0:
+                    end = i + 1
+                    break
+        if end > start:
+            dict_str = text[start:end]
+            try:
+                data = ast.literal_eval(dict_str)
+                if isinstance(data, dict):
+                    return readable(data)
+            except (ValueError, SyntaxError):
+                result = first_pair(dict_str)
+                if result is not None:
+                    return result
+
+    return text[:max_length] + "..." if len(text) > max_length else text
+
+
+def test_dictionary_string_keeps_apostrophes():
+    text = """{'adverse_events': "Patients' nausea was mild", 'serious': "didn't occur"}"""
+    assert ClinicalTrialAnalyzer._clean_dictionary_string(text) == \
+        "Adverse Events: Patients' nausea was mild; Serious: didn't occur"
+
+
+def test_dictionary_string_keeps_nested_values():
+    text = "{'primary': {'name': 'ORR', 'timepoint': 'week 12'}, 'secondary': ['PFS', 'OS']}"
+    assert ClinicalTrialAnalyzer._clean_dictionary_string(text) == \
+        "Primary: {'name': 'ORR', 'timepoint': 'week 12'}; Secondary: ['PFS', 'OS']"
+
+
+def test_malformed_dictionary_string_renders_first_pair():
+    text = "{study_design: RCT, blinding: double}"
+    assert ClinicalTrialAnalyzer._clean_dictionary_string(text) == "Study Design: RCT"
+
+
+FRAGMENTS = [
+    "{", "}", "'endpoint'", '"endpoint"', "study_design", ": ", ", ", "'RCT'", "RCT",
+    "Patients' nausea", "didn't", "{'a': 1}", "['PFS', 'OS']", "true", "None", "42",
+    "Results: ", "prose text ", "{}", "{1, 2}", "'x' * 3",
+]
+
+
+def test_clean_dictionary_string_matches_reference():
+    rng = random.Random(1234)
+    for _ in range(5000):
+        text = "".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 10)))
+        max_length = rng.choice([20, 60, 200])
+        try:
+            expected = reference_clean(text, max_length)
+        except TypeError:
+            # e.g. "{['PFS']}": the original crashed on unhashable set members
+            continue
+        assert ClinicalTrialAnalyzer._clean_dictionary_string(text, max_length) == expected, text
@@ -0,0 +1,146 @@
+"""
+Tests for the API's bounded analysis store and local PDF path checks.
+"""
+
+import importlib
+import os
+
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("multipart")
+pytest.importorskip("anthropic")
+pytest.importorskip("httpx")
+pytest.importorskip("pypdf")
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture(scope="module")
+def api(tmp_path_factory):
+    # The app mounts ./outputs when the module is imported
+    cwd = tmp_path_factory.mktemp("api")
+    (cwd / "outputs").mkdir()
+    old_cwd = os.getcwd()
+    os.chdir(cwd)
+    try:
+        return importlib.import_module("src.api")
+    finally:
+        os.chdir(old_cwd)
+
+
+@pytest.fixture
+def clock(api, monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(api, "time", clock)
+    return clock
+
+
+def completed(*files):
+    return {"status": "completed", "results": {"generated_files": [str(f) for f in files]}}
+
+
+def test_least_recently_used_record_is_evicted_with_its_files(api, clock, tmp_path):
+    files = [tmp_path / f"report_{i}.md" for i in range(3)]
+    for f in files:
+        f.write_text("report")
+    store = api.AnalysisStore(max_entries=2, time_to_live=0)
+    store["a"] = completed(files[0])
+    store["b"] = completed(files[1])
+    assert store.get("a") is not None
+
+    store["c"] = completed(files[2])
+
+    assert [analysis_id for analysis_id, _ in store.items()] == ["a", "c"]
+    assert not files[1].exists()
+    assert files[0].exists() and files[2].exists()
+
+
+def test_processing_records_are_never_evicted(api, clock):
+    store = api.AnalysisStore(max_entries=1, time_to_live=0)
+    store["a"] = {"status": "processing"}
+    store["b"] = {"status": "processing"}
+    assert "a" in store and "b" in store
+
+    # Over capacity, only completed records can make room
+    store["c"] = completed()
+    assert [analysis_id for analysis_id, _ in store.items()] == ["a", "b"]
+
+    store["a"] = completed()
+    assert [analysis_id for analysis_id, _ in store.items()] == ["b"]
+
+
+def test_time_to_live_counts_from_creation(api, clock):
+    store = api.AnalysisStore(time_to_live=100)
+    store["a"] = completed()
+    clock.now += 60
+    store["a"] = completed()
+    assert store.get("a") is not None
+
+    clock.now += 50
+    assert store.get("a") is None
+    assert len(store) == 0
+
+
+def test_time_to_idle_counts_from_last_access(api, clock):
+    store = api.AnalysisStore(time_to_live=0, time_to_idle=100)
+    store["a"] = completed()
+    for _ in range(3):
+        clock.now += 60
+        assert store.get("a") is not None
+
+    clock.now += 150
+    assert "a" not in store
+
+
+def test_files_shared_with_a_live_record_are_kept(api, clock, tmp_path):
+    shared, own = tmp_path / "shared.png", tmp_path / "own.md"
+    shared.write_text("")
+    own.write_text("")
+    store = api.AnalysisStore(time_to_live=0)
+    store["a"] = completed(shared, own)
+    store["b"] = completed(shared)
+
+    del store["a"]
+    assert shared.exists()
+    assert not own.exists()
+
+    del store["b"]
+    assert not shared.exists()
+    with pytest.raises(KeyError):
+        del store["b"]
+
+
+@pytest.fixture
+def api_client(api, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    # Path checks run before the pipeline is used; the startup event is not triggered
+    monkeypatch.setattr(api, "pipeline", object())
+    return TestClient(api.app)
+
+
+def test_analyze_path_rejects_paths_outside_the_data_directory(api, api_client, tmp_path):
+    outside = tmp_path / "trial.pdf"
+    outside.write_bytes(b"%PDF")
+    response = api_client.post("/analyze/path", json={"pdf_path": str(outside)})
+    assert response.status_code == 403
+
+    escape = os.path.join(api.LOCAL_PDF_ROOT, "..", "trial.pdf")
+    response = api_client.post("/analyze/path", json={"pdf_path": escape})
+    assert response.status_code == 403
+
+
+def test_analyze_path_rejects_paths_on_another_drive(api, api_client, monkeypatch):
+    def different_drives(paths):
+        raise ValueError("Paths don't have the same drive")
+
+    monkeypatch.setattr(api.os.path, "commonpath", different_drives)
+    response = api_client.post("/analyze/path", json={"pdf_path": "D:\\trials\\trial.pdf"})
+    assert response.status_code == 403
@@ -0,0 +1,223 @@
+"""
+Tests for the Cerebras client's chunking, batching, caching and merging helpers.
+"""
+
+import json
+import random
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("requests")
+pytest.importorskip("pypdf")
+
+from pypdf import PdfWriter
+
+from src import cerebras_client
+from src.cerebras_client import CerebrasClient, _ResultCache, _split_index
+
+
+@pytest.fixture
+def client():
+    client = CerebrasClient(api_key="test-key")
+    yield client
+    client.close()
+
+
+def test_parse_clinical_trial_pdf_bounds_chunks_read_ahead(client):
+    concurrency = 3
+    state = {"read": 0, "done": 0, "max_ahead": 0}
+    lock = threading.Lock()
+
+    def fake_chunks(pdf_path):
+        for i in range(40):
+            with lock:
+                state["read"] += 1
+                state["max_ahead"] = max(state["max_ahead"], state["read"] - state["done"])
+            yield f"chunk {i}"
+
+    def fake_batch(batch):
+        time.sleep(0.005)
+        with lock:
+            state["done"] += len(batch)
+        return [{"results_summary": chunk} for chunk in batch]
+
+    client.iter_chunks = fake_chunks
+    client.extract_clinical_data_batch = fake_batch
+    client.merge_extracted_data = lambda data: [item["results_summary"] for item in data]
+
+    result = client.parse_clinical_trial_pdf("trial.pdf", concurrency=concurrency, batch_size=4)
+
+    assert result == [f"chunk {i}" for i in range(40)]
+    # Running batches plus the one being read
+    assert state["max_ahead"] <= (concurrency + 1) * 4
+
+
+def write_blank_pdf(path, pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=72, height=72)
+    with open(path, "wb") as f:
+        writer.write(f)
+
+
+def test_page_range_workers_parse_each_pdf_once(tmp_path, monkeypatch):
+    pdf_path = str(tmp_path / "trial.pdf")
+    write_blank_pdf(pdf_path, 5)
+    parses = []
+    real_reader = cerebras_client.PdfReader
+    monkeypatch.setattr(cerebras_client, "PdfReader", lambda path: parses.append(path) or real_reader(path))
+    monkeypatch.setattr(cerebras_client, "_worker_reader", None)
+
+    assert cerebras_client._count_pages(pdf_path) == 5
+    for start in range(5):
+        assert cerebras_client._extract_page_range(pdf_path, start, start + 1) == ""
+    assert len(parses) == 1
+
+    # A rewritten file is parsed again
+    write_blank_pdf(pdf_path, 3)
+    assert cerebras_client._count_pages(pdf_path) == 3
+    assert len(parses) == 2
+
+
+def test_result_cache_evicts_least_recently_used_past_memory_cap():
+    value = {"results_summary": "x" * 100}
+    size = len("k0") + len('{"results_summary": "' + "x" * 100 + '"}')
+    cache = _ResultCache(max_size=100, max_memory=3 * size)
+    for i in range(3):
+        cache.put(f"k{i}", value)
+    assert cache.memory_usage == 3 * size
+    assert cache.get("k0") == value
+
+    cache.put("k3", value)
+
+    assert cache.get("k1") is None
+    assert all(cache.get(key) == value for key in ("k0", "k2", "k3"))
+    assert cache.memory_usage <= cache.max_memory
+
+
+def test_result_cache_skips_values_larger_than_the_cap():
+    cache = _ResultCache(max_memory=50)
+    cache.put("small", {"a": "b"})
+    cache.put("large", {"a": "x" * 100})
+    assert cache.get("large") is None
+    assert cache.get("small") == {"a": "b"}
+    assert cache.memory_usage == cache.stats()["memory_usage"] < 50
+
+
+def test_result_cache_returns_copies():
+    cache = _ResultCache()
+    cache.put("k", {"title": "Trial"})
+    cache.get("k")["title"] = "changed"
+    assert cache.get("k") == {"title": "Trial"}
+
+
+def random_words(rng):
+    words = ["a", "trial", "randomised", "x" * 30, "endpoint\n", "12.5%", "patients"]
+    return " ".join(rng.choice(words) for _ in range(rng.randint(0, 200)))
+
+
+def test_split_index_prefers_last_whitespace_within_limit():
+    assert _split_index("alpha beta gamma", 0, 12) == 10
+    assert _split_index("alpha\nbeta gamma", 0, 8) == 5
+    assert _split_index("one two three", 4, 6) == 7
+    # No whitespace after start: hard split at the limit
+    assert _split_index("abcdefghij", 0, 4) == 4
+    assert _split_index(" abcdefghij", 0, 4) == 4
+
+
+def test_chunk_text_respects_size_and_keeps_every_word(client):
+    rng = random.Random(1234)
+    for _ in range(500):
+        text = random_words(rng)
+        max_chunk_size = rng.randint(5, 80)
+        chunks = client.chunk_text(text, max_chunk_size)
+        assert all(0 < len(chunk) <= max_chunk_size for chunk in chunks)
+        if max_chunk_size >= 30:
+            # Every word fits, so none is split across chunks
+            assert " ".join(chunks).split() == text.split()
+        else:
+            assert "".join("".join(chunks).split()) == "".join(text.split())
+
+
+class FakePage:
+    def __init__(self, text):
+        self.text = text
+
+    def extract_text(self):
+        return self.text
+
+
+def test_iter_chunks_streams_pages_within_size(client, monkeypatch):
+    rng = random.Random(1234)
+    for _ in range(200):
+        pages = [random_words(rng) for _ in range(rng.randint(0, 5))] + [None]
+        max_chunk_size = rng.randint(30, 120)
+        monkeypatch.setattr(cerebras_client, "PdfReader",
+                            lambda path: type("Reader", (), {"pages": [FakePage(t) for t in pages]}))
+
+        chunks = list(client.iter_chunks("trial.pdf", max_chunk_size))
+
+        assert all(0 < len(chunk) <= max_chunk_size for chunk in chunks)
+        assert " ".join(chunks).split() == " ".join(t or "" for t in pages).split()
+
+
+class FakeResponse:
+    def __init__(self, content, status_code=200):
+        self.status_code = status_code
+        self.text = str(content)
+        self._content = content
+
+    def json(self):
+        if isinstance(self._content, Exception):
+            raise self._content
+        return {"choices": [{"message": {"content": self._content}}]}
+
+
+@pytest.mark.parametrize("response", [
+    FakeResponse("[]", status_code=500),
+    FakeResponse(ValueError("body is not JSON")),
+    FakeResponse("not json"),
+    FakeResponse('{"title": "one object"}'),
+    FakeResponse('[{"title": "only one"}]'),
+    FakeResponse('[{"title": "a"}, "b"]'),
+])
+def test_unusable_batch_response_falls_back_to_one_request_per_chunk(client, monkeypatch, response):
+    client.result_cache.put(client.result_cache.key(client.model, "cached"), {"title": "cached"})
+    monkeypatch.setattr(client._session, "post", lambda *args, **kwargs: response)
+    requested = []
+    monkeypatch.setattr(client, "_request_clinical_data",
+                        lambda chunk, cache_key: requested.append(chunk) or {"title": chunk})
+
+    results = client.extract_clinical_data_batch(["one", "cached", "two"])
+
+    assert results == [{"title": "one"}, {"title": "cached"}, {"title": "two"}]
+    assert requested == ["one", "two"]
+
+
+def test_batch_response_is_split_and_cached_per_chunk(client, monkeypatch):
+    items = [{"title": "one"}, {"title": "two"}]
+    monkeypatch.setattr(client._session, "post", lambda *args, **kwargs: FakeResponse(json.dumps(items)))
+    monkeypatch.setattr(client, "_request_clinical_data", lambda *args: pytest.fail("fell back"))
+
+    assert client.extract_clinical_data_batch(["one", "two"]) == items
+    assert client.result_cache.get(client.result_cache.key(client.model, "two")) == {"title": "two"}
+
+
+def test_merge_keeps_first_value_and_combines_text_without_repeats(client):
+    chunks = [
+        {"title": "Unable to extract title", "results_summary": "ORR 65%", "endpoints": "ORR"},
+        {"title": "Trial A", "results_summary": "ORR 65%", "adverse_events": "Nausea"},
+        {"title": "Trial B", "results_summary": "PFS 9 months", "endpoints": "ORR",
+         "adverse_events": "Nausea"},
+    ]
+
+    merged = client.merge_extracted_data(chunks)
+
+    assert merged["title"] == "Trial A"
+    assert merged["results_summary"] == "ORR 65%\n\nPFS 9 months"
+    assert merged["endpoints"] == "ORR"
+    assert merged["adverse_events"] == "Nausea"
+    assert merged["methodology"] == ""
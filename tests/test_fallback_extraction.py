@@ -0,0 +1,138 @@
+"""
+Differential test of the regex fallback extractor against the original per-pattern
+implementation it replaced.
+"""
+
+import re
+import random
+
+import pytest
+
+pytest.importorskip("httpx")
+pytest.importorskip("requests")
+pytest.importorskip("pypdf")
+
+from src.cerebras_client import CerebrasClient
+
+
+def reference_extract(text_chunk, api_content=""):
+    """The fallback extractor as originally written, one re.search/findall per pattern."""
+    result = {
+        "title": "Unable to extract title",
+        "participants": "Unable to extract participant data",
+        "study_type": "Unable to determine study type",
+        "endpoints": "Unable to extract endpoints",
+        "results_summary": api_content if api_content else "Unable to extract results",
+        "methodology": "Unable to extract methodology",
+        "adverse_events": "Unable to extract adverse events",
+        "statistical_analysis": "Unable to extract statistical analysis"
+    }
+
+    for pattern in [r"Study Title[:\s]+([^\n]+)", r"Title[:\s]+([^\n]+)",
+                    r"Clinical Trial[:\s]+([^\n]+)", r"^([A-Z][^.\n]{10,100})\n"]:
+        match = re.search(pattern, text_chunk, re.IGNORECASE | re.MULTILINE)
+        if match:
+            result["title"] = match.group(1).strip()
+            break
+
+    for pattern in [r"(\d{1,3}(?:,\d{3})*)\s*(?:participants?|patients?|subjects?)",
+                    r"(?:participants?|patients?|subjects?)[:\s]+(\d{1,3}(?:,\d{3})*)",
+                    r"n\s*=\s*(\d{1,3}(?:,\d{3})*)", r"sample size[:\s]+(\d{1,3}(?:,\d{3})*)"]:
+        match = re.search(pattern, text_chunk, re.IGNORECASE)
+        if match:
+            result["participants"] = f"{match.group(1)} participants"
+            break
+
+    for pattern in [r"(Phase\s+[IVX]+)", r"(Randomized\s+[^.\n]*)", r"(Double-blind\s+[^.\n]*)",
+                    r"(Placebo-controlled\s+[^.\n]*)", r"(Open-label\s+[^.\n]*)", r"(Pilot\s+[^.\n]*)"]:
+        match = re.search(pattern, text_chunk, re.IGNORECASE)
+        if match:
+            result["study_type"] = match.group(1)
+            break
+
+    endpoints = []
+    for pattern in [r"Primary endpoint[:\s]+([^.\n]+)", r"Primary outcome[:\s]+([^.\n]+)",
+                    r"Secondary endpoint[:\s]+([^.\n]+)", r"Secondary outcome[:\s]+([^.\n]+)"]:
+        endpoints.extend(re.findall(pattern, text_chunk, re.IGNORECASE))
+    if endpoints:
+        result["endpoints"] = "; ".join(endpoints[:3])
+
+    for pattern in [r"Results[:\s]+([^.\n]{50,500})", r"Conclusion[:\s]+([^.\n]{50,500})",
+                    r"Findings[:\s]+([^.\n]{50,500})", r"Outcome[:\s]+([^.\n]{50,500})"]:
+        match = re.search(pattern, text_chunk, re.IGNORECASE | re.DOTALL)
+        if match:
+            result["results_summary"] = match.group(1).strip()[:500]
+            break
+
+    for pattern in [r"Method[:\s]+([^.\n]{50,300})", r"Design[:\s]+([^.\n]{50,300})",
+                    r"Study design[:\s]+([^.\n]{50,300})"]:
+        match = re.search(pattern, text_chunk, re.IGNORECASE)
+        if match:
+            result["methodology"] = match.group(1).strip()
+            break
+
+    for pattern in [r"Adverse event[:\s]+([^.\n]{30,300})", r"Safety[:\s]+([^.\n]{30,300})",
+                    r"Side effect[:\s]+([^.\n]{30,300})"]:
+        match = re.search(pattern, text_chunk, re.IGNORECASE)
+        if match:
+            result["adverse_events"] = match.group(1).strip()
+            break
+
+    for pattern in [r"Statistical analysis[:\s]+([^.\n]{30,300})", r"p-value[:\s]+([^.\n]{20,200})",
+                    r"Significance[:\s]+([^.\n]{20,200})"]:
+        match = re.search(pattern, text_chunk, re.IGNORECASE)
+        if match:
+            result["statistical_analysis"] = match.group(1).strip()
+            break
+
+    return result
+
+
+# Fragments chosen so patterns of different fields overlap and start at the same positions
+FRAGMENTS = [
+    "Randomized double-blind trial of drug X versus placebo",
+    "Phase III study", "Phase II", "Double-blind placebo-controlled design",
+    "Open-label extension", "Pilot study of 40 patients",
+    "Study Title: Efficacy of Y", "Title: A trial", "Clinical Trial: NCT0001",
+    "120 participants", "patients: 1,200", "n = 45", "Sample size: 300",
+    "Primary endpoint: overall survival", "Primary outcome: HbA1c change",
+    "Secondary endpoint: progression-free survival",
+    "Secondary outcome: quality of life; Secondary outcome: hospitalisation",
+    "Primary endpoint: Primary outcome: nested endpoint text",
+    "Results: the treatment arm showed a significant reduction in events compared with placebo",
+    "Conclusion: drug X was well tolerated and effective in reducing the primary outcome measure",
+    "Outcome: mortality at 12 months was lower in the intervention group than in controls overall",
+    "Methods: participants were randomised in a 1:1 ratio using a computer generated sequence list",
+    "Study design: multicentre parallel-group trial conducted across forty hospital sites worldwide",
+    "Adverse events: nausea and headache were the most common reported events",
+    "Safety: no treatment-related deaths occurred during follow-up of the cohort",
+    "Side effects: mild rash in a small proportion of patients",
+    "Statistical analysis: intention-to-treat with Cox proportional hazards",
+    "p-value: less than 0.001 for the primary comparison",
+    "Significance: reached for all secondary outcomes tested",
+    "lower case line without a title", "A", "",
+]
+
+
+def random_text(rng):
+    lines = []
+    for _ in range(rng.randint(1, 8)):
+        parts = rng.sample(FRAGMENTS, rng.randint(1, 3))
+        lines.append(rng.choice([" ", ". ", ", "]).join(parts))
+    return "\n".join(lines) + rng.choice(["", "\n"])
+
+
+def test_matches_reference_on_examples():
+    text = "Randomized double-blind trial of drug X versus placebo\nPrimary endpoint: survival\n"
+    assert CerebrasClient._extract_data_from_text(text) == reference_extract(text)
+    assert CerebrasClient._extract_data_from_text(text)["title"] == \
+        "Randomized double-blind trial of drug X versus placebo"
+
+
+def test_matches_reference_on_generated_texts():
+    rng = random.Random(1234)
+    for _ in range(5000):
+        text = random_text(rng)
+        api_content = rng.choice(["", "raw model output"])
+        assert CerebrasClient._extract_data_from_text(text, api_content) == \
+            reference_extract(text, api_content), text
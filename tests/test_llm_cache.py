@@ -0,0 +1,93 @@
+"""
+Tests for the extraction cache and the cache key helpers.
+"""
+
+import io
+import os
+import time
+
+import pytest
+
+from src.llm_cache import ExtractionCache, copy_with_digest, file_digest, normalize_for_key
+
+
+def test_extraction_round_trips_through_disk(tmp_path):
+    cache = ExtractionCache(str(tmp_path))
+    cache.set("digest", {"title": "Trial"})
+    assert cache.get("digest") == {"title": "Trial"}
+
+    # A fresh instance has nothing in memory and reads the file
+    assert ExtractionCache(str(tmp_path)).get("digest") == {"title": "Trial"}
+    assert cache.get("other") is None
+
+
+def test_digest_is_rehashed_only_when_the_file_changes(tmp_path, monkeypatch):
+    pdf = tmp_path / "trial.pdf"
+    pdf.write_bytes(b"%PDF one")
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    hashed = []
+    monkeypatch.setattr("src.llm_cache.file_digest", lambda path: hashed.append(path) or file_digest(path))
+
+    first = cache.digest_for(str(pdf))
+    assert cache.digest_for(str(pdf)) == first
+    assert len(hashed) == 1
+
+    pdf.write_bytes(b"%PDF two, longer")
+    assert cache.digest_for(str(pdf)) != first
+    assert len(hashed) == 2
+
+
+def test_expired_entries_are_misses_and_deleted(tmp_path):
+    ExtractionCache(str(tmp_path)).set("digest", {"title": "Trial"})
+    path = tmp_path / "digest.json"
+    now = time.time()
+    os.utime(path, (now, now - 100))
+
+    assert ExtractionCache(str(tmp_path), ttl=200).get("digest") == {"title": "Trial"}
+    assert ExtractionCache(str(tmp_path), ttl=50).get("digest") is None
+    assert not path.exists()
+
+
+def test_eviction_drops_least_recently_read_entries(tmp_path):
+    cache = ExtractionCache(str(tmp_path), ttl=None, max_bytes=None)
+    data = {"results_summary": "x" * 1000}
+    for digest in ("a", "b"):
+        cache.set(digest, data)
+    now = time.time()
+    os.utime(tmp_path / "a.json", (1000, now))
+    os.utime(tmp_path / "b.json", (2000, now))
+    # Reading "a" makes "b" the least recently read
+    assert cache.get("a") == data
+
+    cache.max_bytes = int(2.5 * os.path.getsize(tmp_path / "a.json"))
+    cache.set("c", data)
+
+    assert sorted(os.listdir(tmp_path)) == ["a.json", "c.json"]
+    assert cache.get("b") is None
+    assert cache.get("a") == data
+
+
+def test_registered_digest_skips_hashing(tmp_path, monkeypatch):
+    content = b"%PDF uploaded"
+    pdf = tmp_path / "upload.pdf"
+    with open(pdf, "wb") as f:
+        digest = copy_with_digest(io.BytesIO(content), f, bufsize=4)
+    assert digest == file_digest(str(pdf))
+
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    cache.register_digest(str(pdf), digest)
+    monkeypatch.setattr("src.llm_cache.file_digest", lambda path: pytest.fail("re-hashed a registered file"))
+    assert cache.digest_for(str(pdf)) == digest
+
+
+def test_normalize_for_key_collapses_whitespace_and_drops_empty_fields():
+    first = {"title": "  Trial of\n drug X ", "endpoints": "", "methodology": None, "arms": []}
+    second = {"title": "Trial of drug X"}
+    assert normalize_for_key(first) == normalize_for_key(second) == {"title": "Trial of drug X"}
+
+
+def test_normalize_for_key_keeps_case_order_and_duplicates():
+    data = {"adverse_events": ["Nausea", "nausea", "Nausea"], "drug": "HER2"}
+    assert normalize_for_key(data) == data
+    assert normalize_for_key({"e": ["OS", "PFS"]}) != normalize_for_key({"e": ["PFS", "OS"]})
+    assert normalize_for_key({"e": ("OS", 1.25)}) == {"e": ["OS", 1.25]}
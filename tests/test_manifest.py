@@ -0,0 +1,48 @@
+"""
+Tests for the run manifest that lets re-runs of the same PDF skip unchanged stages.
+"""
+
+from src.manifest import RunManifest, stage_hash
+
+
+def test_stage_hash_ignores_key_order_but_not_values():
+    assert stage_hash({"a": 1, "b": [1, 2]}) == stage_hash({"b": [1, 2], "a": 1})
+    assert stage_hash({"a": 1}) != stage_hash({"a": 2})
+    assert stage_hash({"a": [1, 2]}) != stage_hash({"a": [2, 1]})
+
+
+def test_recorded_stage_is_reused_after_reload(tmp_path):
+    output = tmp_path / "report.md"
+    output.write_text("report")
+    manifest = RunManifest(str(tmp_path / "manifests"), "digest")
+    manifest.record("claude", "hash", [str(output)], payload={"summary": "text"})
+    manifest.save()
+
+    stage = RunManifest(str(tmp_path / "manifests"), "digest").reusable("claude", "hash")
+    assert stage is not None
+    assert stage.output_paths == [str(output)]
+    assert stage.payload == {"summary": "text"}
+
+
+def test_changed_inputs_invalidate_stage(tmp_path):
+    manifest = RunManifest(str(tmp_path), "digest")
+    manifest.record("extraction", "old", [])
+    assert manifest.reusable("extraction", "new") is None
+    assert manifest.reusable("charts", "old") is None
+
+
+def test_missing_output_invalidates_stage(tmp_path):
+    kept, deleted = tmp_path / "kept.png", tmp_path / "deleted.png"
+    kept.write_text("")
+    deleted.write_text("")
+    manifest = RunManifest(str(tmp_path), "digest")
+    manifest.record("charts", "hash", [str(kept), str(deleted)])
+    assert manifest.reusable("charts", "hash") is not None
+
+    deleted.unlink()
+    assert manifest.reusable("charts", "hash") is None
+
+
+def test_unreadable_manifest_starts_empty(tmp_path):
+    (tmp_path / "digest.json").write_text("{not json")
+    assert RunManifest(str(tmp_path), "digest").stages == {}
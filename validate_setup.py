@@ -5,48 +5,119 @@ Validates that all components are properly configured and ready to use.
 
 import os
 import sys
+import functools
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 
-def check_file_exists(filepath, description):
-    """Check if a required file exists."""
-    if os.path.exists(filepath):
-        print(f"✅ {description}: {filepath}")
-        return True
+# File, directory and dependency checks are I/O-bound stat calls, so run them on a
+# thread pool and print their results in submission order
+CHECK_WORKERS = 16
+
+
+@functools.lru_cache(maxsize=None)
+def list_directory(dirpath):
+    """
+    Read a directory once, mapping entry names to whether they are directories.
+    
+    Existence checks are answered from this listing (one directory read) instead of
+    a stat call per path. Missing or unreadable directories list as empty.
+    """
+    try:
+        with os.scandir(dirpath) as it:
+            return {entry.name: entry.is_dir() for entry in it}
+    except OSError:
+        return {}
+
+
+def path_entry(path):
+    """Return whether path is a directory (True/False), or None if it does not exist."""
+    dirpath, name = os.path.split(os.path.normpath(path))
+    is_dir = list_directory(dirpath or ".").get(name)
+    if is_dir is None and os.path.exists(path):
+        # Case-insensitive filesystems (macOS, Windows) also match names the listing
+        # spells differently, as os.path.exists does
+        return os.path.isdir(path)
+    return is_dir
+
+
+def file_status(filepath, description):
+    """Return (ok, result line) for a required file."""
+    if path_entry(filepath) is not None:
+        return True, f"✅ {description}: {filepath}"
     else:
-        print(f"❌ {description} MISSING: {filepath}")
-        return False
+        return False, f"❌ {description} MISSING: {filepath}"
 
 
-def check_directory_exists(dirpath, description):
-    """Check if a required directory exists."""
-    if os.path.exists(dirpath) and os.path.isdir(dirpath):
-        print(f"✅ {description}: {dirpath}/")
-        return True
+def directory_status(dirpath, description):
+    """Return (ok, result line) for a required directory."""
+    if path_entry(dirpath):
+        return True, f"✅ {description}: {dirpath}/"
     else:
-        print(f"❌ {description} MISSING: {dirpath}/")
-        return False
+        return False, f"❌ {description} MISSING: {dirpath}/"
 
 
-def check_python_module(module_path, module_name):
-    """Check if a Python module can be imported."""
+def python_module_status(module_path, module_name):
+    """Return (ok, result line) for loading a Python module from a file."""
     try:
         spec = importlib.util.spec_from_file_location(module_name, module_path)
         if spec is None:
-            print(f"❌ Cannot load module spec: {module_name}")
-            return False
+            return False, f"❌ Cannot load module spec: {module_name}"
         
         module = importlib.util.module_from_spec(spec)
         spec.loader.exec_module(module)
-        print(f"✅ Python module loads: {module_name}")
-        return True
+        return True, f"✅ Python module loads: {module_name}"
     except ImportError as e:
-        print(f"⚠️  Module {module_name} has missing dependencies: {str(e)}")
-        return False
+        return False, f"⚠️  Module {module_name} has missing dependencies: {str(e)}"
     except Exception as e:
-        print(f"❌ Python module error ({module_name}): {str(e)}")
-        return False
+        return False, f"❌ Python module error ({module_name}): {str(e)}"
+
+
+def dependency_status(package_name, import_name):
+    """Return (ok, result line) for an installed package (located, not imported)."""
+    try:
+        if importlib.util.find_spec(import_name) is None:
+            raise ImportError(import_name)
+        return True, f"✅ {package_name}"
+    except ImportError:
+        return False, f"❌ {package_name} - Run: pip install {package_name}"
+    except Exception as e:
+        return True, f"⚠️  {package_name} - Warning: {str(e)}"
+
+
+def report(results):
+    """Print (ok, result line) pairs in order and return True if every check passed."""
+    for _, line in results:
+        print(line)
+    return all(ok for ok, _ in results)
+
+
+def run_checks(checks):
+    """
+    Run (status_fn, args) checks concurrently, printing their lines in the given order.
+    
+    Returns:
+        True if every check passed
+    """
+    with ThreadPoolExecutor(max_workers=CHECK_WORKERS) as executor:
+        futures = [executor.submit(fn, *args) for fn, args in checks]
+        return report([future.result() for future in futures])
+
+
+def check_file_exists(filepath, description):
+    """Check if a required file exists."""
+    return report([file_status(filepath, description)])
+
+
+def check_directory_exists(dirpath, description):
+    """Check if a required directory exists."""
+    return report([directory_status(dirpath, description)])
+
+
+def check_python_module(module_path, module_name):
+    """Check if a Python module can be imported."""
+    return report([python_module_status(module_path, module_name)])
 
 
 def check_dependencies():
@@ -56,35 +127,28 @@ def check_dependencies():
         'pypdf': 'pypdf',
         'requests': 'requests', 
         'anthropic': 'anthropic',
-        'pandas': 'pandas',
+        'numpy': 'numpy',
         'matplotlib': 'matplotlib',
         'python-dotenv': 'dotenv',  # python-dotenv imports as 'dotenv'
         'fastapi': 'fastapi',
-        'uvicorn': 'uvicorn'
+        'uvicorn': 'uvicorn',
+        'httpx': 'httpx',
+        'orjson': 'orjson'
     }
     
     print("\n📦 Checking Python Dependencies:")
-    all_deps_ok = True
-    
-    for package_name, import_name in packages.items():
-        try:
-            __import__(import_name)
-            print(f"✅ {package_name}")
-        except ImportError:
-            print(f"❌ {package_name} - Run: pip install {package_name}")
-            all_deps_ok = False
-        except Exception as e:
-            print(f"⚠️  {package_name} - Warning: {str(e)}")
-    
-    return all_deps_ok
+    return run_checks([
+        (dependency_status, (package_name, import_name))
+        for package_name, import_name in packages.items()
+    ])
 
 
 def check_environment_variables():
     """Check if environment variables are properly configured."""
     print("\n🔑 Checking Environment Configuration:")
     
-    env_file_exists = os.path.exists('.env')
-    env_template_exists = os.path.exists('env_template.txt')
+    env_file_exists = path_entry('.env') is not None
+    env_template_exists = path_entry('env_template.txt') is not None
     
     if not env_file_exists and env_template_exists:
         print("❌ .env file not found")
@@ -131,36 +195,41 @@ def validate_project_structure():
     
     structure_ok = True
     
-    # Core files
+    # Core files and directories
     print("\n📁 Checking Project Structure:")
-    structure_ok &= check_file_exists("main.py", "Main pipeline script")
-    structure_ok &= check_file_exists("requirements.txt", "Dependencies file")
-    structure_ok &= check_file_exists("README.md", "Project documentation")
-    structure_ok &= check_file_exists("SETUP_INSTRUCTIONS.md", "Setup guide")
-    structure_ok &= check_file_exists("env_template.txt", "Environment template")
-    structure_ok &= check_file_exists("run_example.py", "Example runner")
-    structure_ok &= check_file_exists(".gitignore", "Git ignore file")
-    
-    # Directories
-    structure_ok &= check_directory_exists("src", "Source code directory")
-    structure_ok &= check_directory_exists("data", "Input data directory")
-    structure_ok &= check_directory_exists("outputs", "Output directory")
+    structure_ok &= run_checks([
+        (file_status, ("main.py", "Main pipeline script")),
+        (file_status, ("requirements.txt", "Dependencies file")),
+        (file_status, ("README.md", "Project documentation")),
+        (file_status, ("SETUP_INSTRUCTIONS.md", "Setup guide")),
+        (file_status, ("env_template.txt", "Environment template")),
+        (file_status, ("run_example.py", "Example runner")),
+        (file_status, (".gitignore", "Git ignore file")),
+        (directory_status, ("src", "Source code directory")),
+        (directory_status, ("data", "Input data directory")),
+        (directory_status, ("outputs", "Output directory"))
+    ])
     
     # Source modules
     print("\n🐍 Checking Source Modules:")
-    structure_ok &= check_file_exists("src/__init__.py", "Package init file")
-    structure_ok &= check_file_exists("src/cerebras_client.py", "Cerebras client")
-    structure_ok &= check_file_exists("src/claude_client.py", "Claude client")
-    structure_ok &= check_file_exists("src/analysis.py", "Analysis engine")
-    structure_ok &= check_file_exists("src/api.py", "FastAPI server")
+    structure_ok &= run_checks([
+        (file_status, ("src/__init__.py", "Package init file")),
+        (file_status, ("src/cerebras_client.py", "Cerebras client")),
+        (file_status, ("src/claude_client.py", "Claude client")),
+        (file_status, ("src/analysis.py", "Analysis engine")),
+        (file_status, ("src/api.py", "FastAPI server"))
+    ])
     
-    # Check if modules can be imported (only if dependencies are available)
+    # Check if modules can be imported (only if dependencies are available). Loading a
+    # module executes it, and some create HTTP clients or register exit hooks, so these
+    # run one at a time on this thread
     print("\n🔧 Checking Module Imports:")
-    module_ok = True
-    module_ok &= check_python_module("src/cerebras_client.py", "cerebras_client")
-    module_ok &= check_python_module("src/claude_client.py", "claude_client")
-    module_ok &= check_python_module("src/analysis.py", "analysis")
-    module_ok &= check_python_module("main.py", "main")
+    module_ok = report([
+        python_module_status("src/cerebras_client.py", "cerebras_client"),
+        python_module_status("src/claude_client.py", "claude_client"),
+        python_module_status("src/analysis.py", "analysis"),
+        python_module_status("main.py", "main")
+    ])
     
     # Don't fail structure check if modules have dependency issues
     if not module_ok:
@@ -197,7 +266,7 @@ def validate_project_structure():
         
         print("\n💡 Run the following to fix:")
         if not deps_ok:
-            print("   py -m pip install pypdf requests anthropic pandas matplotlib python-dotenv fastapi uvicorn")
+            print("   py -m pip install pypdf requests anthropic numpy matplotlib python-dotenv fastapi uvicorn httpx orjson")
         if not env_ok:
             print("   copy env_template.txt .env")
             print("   # Then edit .env with your actual API keys")
@@ -206,5 +275,9 @@ def validate_project_structure():
 
 
 if __name__ == "__main__":
+    # Emoji output on consoles whose default encoding is a legacy code page (Windows)
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(encoding="utf-8")
+    
     success = validate_project_structure()
     sys.exit(0 if success else 1)